@@ -0,0 +1,103 @@
+"""
+Compares ad-hoc dicts with the typed listing records (core.listing) on a
+synthetic history built by repeating the scraped/parsed sample files.
+
+Reports memory per listing (tracemalloc) and JSONL/CSV serialisation time.
+
+Usage:
+    python benchmarks/listings.py [--copies 2000]
+"""
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.csv_io import _flatten
+from core.listing import (
+    ParsedListing, RawListing, listings_from_dicts, write_listings_csv, write_listings_jsonl, read_listings_jsonl
+)
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RAW_SAMPLE = os.path.join(ROOT, "data", "scraped", "tablets.json")
+PARSED_SAMPLE = os.path.join(ROOT, "data", "processed", "tablets_parsed.json")
+
+
+def _history(path, copies):
+    # json round trip per copy so every record owns its own strings, like a real history
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    out = []
+    for _ in range(copies):
+        out.extend(json.loads(text))
+    return out
+
+
+def _measure_memory(build):
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _dicts_to_csv(records, path):
+    # what utils.json_to_csv does with ad-hoc dicts
+    flattened = [_flatten(rec) for rec in records]
+    fieldnames = sorted({k for flat in flattened for k in flat})
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        for row in flattened:
+            writer.writerow({k: (row.get(k) if row.get(k) is not None else "") for k in fieldnames})
+
+
+def _dicts_to_jsonl(records, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+def run(label, path, cls, copies, tmp):
+    records, dict_bytes = _measure_memory(lambda: _history(path, copies))
+    # the intermediate dicts are garbage once the records are built, so only the records are counted
+    listings, typed_bytes = _measure_memory(lambda: listings_from_dicts(_history(path, copies), cls))
+    n = len(records)
+
+    csv_path = os.path.join(tmp, "out.csv")
+    jsonl_path = os.path.join(tmp, "out.jsonl")
+    t_dict_csv = _timed(lambda: _dicts_to_csv(records, csv_path))
+    t_typed_csv = _timed(lambda: write_listings_csv(csv_path, listings))
+    t_dict_jsonl = _timed(lambda: _dicts_to_jsonl(records, jsonl_path))
+    t_typed_jsonl = _timed(lambda: write_listings_jsonl(jsonl_path, listings))
+    t_typed_read = _timed(lambda: read_listings_jsonl(jsonl_path, cls))
+
+    print(f"{label}: {n} listings")
+    print(f"  memory       dicts {dict_bytes / n:8.0f} B/listing   typed {typed_bytes / n:8.0f} B/listing")
+    print(f"  csv write    dicts {t_dict_csv * 1000:8.1f} ms          typed {t_typed_csv * 1000:8.1f} ms")
+    print(f"  jsonl write  dicts {t_dict_jsonl * 1000:8.1f} ms          typed {t_typed_jsonl * 1000:8.1f} ms")
+    print(f"  jsonl read   typed {t_typed_read * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Listing record memory/serialisation benchmark")
+    parser.add_argument("--copies", type=int, default=2000, help="How many times to repeat the sample files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run("raw", RAW_SAMPLE, RawListing, args.copies, tmp)
+        run("parsed", PARSED_SAMPLE, ParsedListing, args.copies, tmp)
+
+
+if __name__ == "__main__":
+    main()
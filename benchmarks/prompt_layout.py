@@ -0,0 +1,54 @@
+"""
+Compares prompt-eval time per row of the "input_first" and "prefix" prompt
+layouts of parsing_agent.parse_json_file against a running Ollama server.
+
+Both layouts parse the same rows; the per-run summaries are printed and
+appended to benchmarks/results/prompt_layout.jsonl.
+
+Usage:
+    python benchmarks/prompt_layout.py [--input data/scraped/tablets.json] [--rows 5]
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from parsing_agent import PROMPT_LAYOUTS, parse_json_file
+from tablets_schema import DYNAMIC_INSTRUCTIONS, OUTPUT_SCHEMA
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results", "prompt_layout.jsonl")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt layout prompt-eval benchmark")
+    parser.add_argument("--input", type=str, default=os.path.join(ROOT, "data", "scraped", "tablets.json"))
+    parser.add_argument("--rows", type=int, default=5, help="Rows to parse per layout")
+    args = parser.parse_args()
+
+    with open(args.input, encoding="utf-8") as f:
+        rows = json.load(f)[:args.rows]
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "rows.json")
+        with open(input_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False)
+        for layout in reversed(PROMPT_LAYOUTS):
+            print(f"\n### layout: {layout}")
+            parse_json_file(
+                input_json_path=input_path,
+                output_json_path=os.path.join(tmp, f"{layout}.json"),
+                output_schema=OUTPUT_SCHEMA,
+                dynamic_instructions=DYNAMIC_INSTRUCTIONS,
+                queries_path=None,
+                prompt_layout=layout,
+                stats_path=RESULTS_PATH,
+            )
+    print(f"\nAppended results to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
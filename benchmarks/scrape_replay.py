@@ -0,0 +1,76 @@
+"""
+Times the scrape pipeline (search pages, detail pages, parsing into
+RawListing records) replayed from a recorded page cache, with no network.
+
+Record the pages once with a live scan:
+    python scraping_scripts/scan_sources.py --query tablet --item_count 50 --cache_dir data/cache/pages
+
+then replay them:
+    python benchmarks/scrape_replay.py --query tablet --item_count 50
+
+Best/median wall times are printed and appended to
+benchmarks/results/scrape_replay.jsonl.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.page_cache import DEFAULT_CACHE_DIR, PageCache
+from core.scanner import ScanJob, run_scans
+from core.sources.olx import LOCALISATION_ADDON, NO_LOCALISATION_ADDON
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results", "scrape_replay.jsonl")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scrape replay benchmark")
+    parser.add_argument("--query", type=str, required=True, help="Query recorded in the cache (e.g. 'tablet')")
+    parser.add_argument("--sources", type=str, default="olx", help="Comma separated sources")
+    parser.add_argument("--item_count", type=int, default=10, help="Max number of items per source")
+    parser.add_argument("--localisation", type=str, choices=["true", "false"], default="true",
+                        help="Location used by the olx recording")
+    parser.add_argument("--cache_dir", type=str, default=os.path.join(ROOT, DEFAULT_CACHE_DIR))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    location = LOCALISATION_ADDON if args.localisation == "true" else NO_LOCALISATION_ADDON
+    jobs = [
+        ScanJob(name, args.query, args.item_count, {"location": location} if name == "olx" else {})
+        for name in args.sources.split(",")
+    ]
+
+    times = []
+    for _ in range(args.runs):
+        cache = PageCache(args.cache_dir, offline=True)
+        start = time.perf_counter()
+        results = run_scans(jobs, cache=cache)
+        times.append(time.perf_counter() - start)
+        if cache.misses:
+            print(f"{cache.misses} pages were not in the cache; record them with a live scan first.")
+
+    records = sum(len(r) for r in results)
+    best, median = min(times), statistics.median(times)
+    print(f"{records} records   best {best * 1000:8.1f} ms   median {median * 1000:8.1f} ms")
+
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "query": args.query,
+        "sources": args.sources,
+        "records": records,
+        "best_ms": round(best * 1000, 1),
+        "median_ms": round(median * 1000, 1),
+    }
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"Appended results to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Measures cold-start (import) time of the CLI entry points.
+
+Each entry point is imported in a fresh interpreter several times and the
+best/median wall times are printed and appended to
+benchmarks/results/startup.jsonl, so regressions can be tracked over time.
+
+Usage:
+    python benchmarks/startup.py [--runs 5]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results", "startup.jsonl")
+
+ENTRY_POINTS = {
+    "python": "pass",
+    "core": "import core.csv_io, core.json_io, core.olx_scraper",
+    "utils.json_to_csv": "import utils.json_to_csv",
+    "utils.json_to_csv_2": "import utils.json_to_csv_2",
+    "scraping_scripts.olx_scrape_fn": "import scraping_scripts.olx_scrape_fn",
+    "scraping_scripts.olx_scrape_fn_json": "import scraping_scripts.olx_scrape_fn_json",
+    "parsing_agent": "import parsing_agent",
+}
+
+
+def _git_rev():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def time_import(code, runs):
+    """
+    Returns a list of wall times (seconds) of `python -c code` in fresh interpreters.
+    Returns None if the import fails (e.g. a dependency is not installed).
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            return None
+        times.append(elapsed)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start time of CLI entry points")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreter runs per entry point")
+    args = parser.parse_args()
+
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_rev": _git_rev(),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "entry_points": {},
+    }
+    for name, code in ENTRY_POINTS.items():
+        times = time_import(code, args.runs)
+        if times is None:
+            print(f"{name:40s} import failed")
+            record["entry_points"][name] = None
+            continue
+        best, median = min(times), statistics.median(times)
+        print(f"{name:40s} best {best * 1000:8.1f} ms   median {median * 1000:8.1f} ms")
+        record["entry_points"][name] = {"best_ms": round(best * 1000, 1), "median_ms": round(median * 1000, 1)}
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"Appended results to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Core pipeline functions.
+
+Everything in this package is plain Python with no agent-framework imports,
+so CLI entry points and scripts can use it without paying the LangChain
+import cost. LangChain Tool wrappers are built on demand by tool_registry.
+"""
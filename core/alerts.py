@@ -0,0 +1,399 @@
+"""
+Standing-query engine for alerts on newly parsed listings.
+
+Saved searches are predicates over the parsed listing fields (OUTPUT_SCHEMA
+in tablets_schema.py), e.g.
+
+    {"id": "tablet-8gb", "name": "Tablet with 8GB RAM",
+     "where": {"ram_size": {"min": 8}, "price": {"max": 1500},
+               "manufacturer": ["Samsung", "Lenovo"],
+               "model": {"contains": "tab"}}}
+
+Condition forms:
+    {"min": a, "max": b}  numeric range (either bound optional, inclusive)
+    "value" / ["a", "b"]  case-insensitive equality / any of
+    {"contains": "text"}  case-insensitive substring
+
+Ranges are compiled into one interval tree per field and equality
+conditions into inverted indexes, so a listing is matched against all
+queries by stabbing each tree and looking up each index once, touching only
+the queries that can match. Substring conditions are checked afterwards on
+those candidates only.
+
+Matches are passed to a notification sink; JsonlSink appends them to a local
+file and skips listings it has already reported for the same query
+(by URL, or by content for listings without a real URL).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.listing import NUMERIC_FIELDS, ParsedListing, parse_number, read_listings_json
+
+DEFAULT_QUERIES_PATH = "data/alerts/queries.json"
+DEFAULT_ALERTS_PATH = "data/alerts/alerts.jsonl"
+INF = float("inf")
+
+
+####################################################################
+# Interval tree
+####################################################################
+
+class IntervalTree:
+    """
+    Static centered interval tree over closed intervals (lo, hi, key).
+    stab(x) yields the keys of all intervals containing x in O(log n + k).
+    """
+    __slots__ = ("center", "by_lo", "by_hi", "left", "right")
+
+    def __init__(self, intervals: List[Tuple[float, float, Any]]):
+        # Empty intervals (lo > hi) can never be stabbed
+        intervals = [i for i in intervals if i[0] <= i[1]]
+        points = sorted(p for lo, hi, _ in intervals for p in (lo, hi) if p not in (INF, -INF))
+        self.center = points[len(points) // 2] if points else 0.0
+        here, left, right = [], [], []
+        for interval in intervals:
+            lo, hi, _ = interval
+            if hi < self.center:
+                left.append(interval)
+            elif lo > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        self.by_lo = sorted(here, key=lambda i: i[0])
+        self.by_hi = sorted(here, key=lambda i: i[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def stab(self, x: float):
+        node = self
+        while node is not None:
+            if x < node.center:
+                for lo, _, key in node.by_lo:
+                    if lo > x:
+                        break
+                    yield key
+                node = node.left
+            elif x > node.center:
+                for _, hi, key in node.by_hi:
+                    if hi < x:
+                        break
+                    yield key
+                node = node.right
+            else:
+                for _, _, key in node.by_lo:
+                    yield key
+                return
+
+
+####################################################################
+# Queries
+####################################################################
+
+def _field_value(listing, name):
+    if isinstance(listing, dict):
+        return listing.get(name)
+    if name in ParsedListing.CSV_HEADER:
+        return getattr(listing, name)
+    return listing.extra.get(name) if listing.extra else None
+
+
+def _norm(value) -> str:
+    # Numbers compare by value, so 8 and 8.0 are the same key
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return repr(float(value))
+    return str(value).strip().casefold()
+
+
+class StandingQuery:
+    """
+    One saved search, split into indexable conditions (ranges, equality) and
+    residual ones (substring) checked on candidates only.
+    """
+    __slots__ = ("id", "name", "where", "ranges", "equals", "contains")
+
+    def __init__(self, id: str, where: Dict[str, Any], name: str = ""):
+        self.id = id
+        self.name = name or id
+        self.where = where
+        self.ranges: Dict[str, Tuple[float, float]] = {}
+        self.equals: Dict[str, List[str]] = {}
+        self.contains: Dict[str, str] = {}
+        for field_name, cond in where.items():
+            if isinstance(cond, dict) and ("min" in cond or "max" in cond):
+                lo = parse_number(cond.get("min"))
+                hi = parse_number(cond.get("max"))
+                lo, hi = -INF if lo is None else lo, INF if hi is None else hi
+                if lo > hi:
+                    raise ValueError(f"Query '{id}': empty range for '{field_name}': {cond!r}")
+                self.ranges[field_name] = (lo, hi)
+            elif isinstance(cond, dict) and "contains" in cond:
+                self.contains[field_name] = _norm(cond["contains"])
+            elif isinstance(cond, (list, tuple)):
+                self.equals[field_name] = [_norm(v) for v in cond]
+            elif isinstance(cond, (int, float)) and not isinstance(cond, bool):
+                self.ranges[field_name] = (float(cond), float(cond))
+            elif isinstance(cond, str):
+                self.equals[field_name] = [_norm(cond)]
+            else:
+                raise ValueError(f"Query '{id}': unsupported condition for '{field_name}': {cond!r}")
+
+    @property
+    def indexed_count(self) -> int:
+        return len(self.ranges) + len(self.equals)
+
+    def check_residual(self, listing) -> bool:
+        for field_name, needle in self.contains.items():
+            value = _field_value(listing, field_name)
+            if value is None or needle not in _norm(value):
+                return False
+        return True
+
+    def check(self, listing) -> bool:
+        """
+        Full (unindexed) evaluation, used to verify the indexes.
+        """
+        for field_name, (lo, hi) in self.ranges.items():
+            value = parse_number(_field_value(listing, field_name))
+            if value is None or not lo <= value <= hi:
+                return False
+        for field_name, allowed in self.equals.items():
+            value = _field_value(listing, field_name)
+            if value is None or _norm(value) not in allowed:
+                return False
+        return self.check_residual(listing)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "name": self.name, "where": self.where}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StandingQuery":
+        return cls(data["id"], data.get("where", {}), data.get("name", ""))
+
+
+class StandingQueryEngine:
+    """
+    Holds all saved queries and their indexes. Indexes are rebuilt lazily
+    after queries are added or removed.
+    """
+
+    def __init__(self, queries: Iterable[StandingQuery] = ()):
+        self.queries: Dict[str, StandingQuery] = {}
+        self._trees: Dict[str, IntervalTree] = {}
+        self._inverted: Dict[str, Dict[str, List[str]]] = {}
+        self._unindexed: List[str] = []
+        self._dirty = True
+        for query in queries:
+            self.add_query(query)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_QUERIES_PATH) -> "StandingQueryEngine":
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            return cls(StandingQuery.from_dict(q) for q in json.load(f))
+
+    def save(self, path: str = DEFAULT_QUERIES_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([q.to_dict() for q in self.queries.values()], f, ensure_ascii=False, indent=2)
+
+    def add_query(self, query: StandingQuery):
+        self.queries[query.id] = query
+        self._dirty = True
+
+    def remove_query(self, query_id: str):
+        if self.queries.pop(query_id, None) is not None:
+            self._dirty = True
+
+    def _build(self):
+        ranges: Dict[str, list] = {}
+        inverted: Dict[str, Dict[str, List[str]]] = {}
+        unindexed = []
+        for query in self.queries.values():
+            for field_name, (lo, hi) in query.ranges.items():
+                ranges.setdefault(field_name, []).append((lo, hi, query.id))
+            for field_name, values in query.equals.items():
+                index = inverted.setdefault(field_name, {})
+                for value in set(values):
+                    index.setdefault(value, []).append(query.id)
+            if not query.indexed_count:
+                unindexed.append(query.id)
+        self._trees = {name: IntervalTree(intervals) for name, intervals in ranges.items()}
+        self._inverted = inverted
+        self._unindexed = unindexed
+        self._dirty = False
+
+    def match(self, listing) -> List[StandingQuery]:
+        """
+        Returns the queries matched by one listing (ParsedListing or dict).
+        """
+        if self._dirty:
+            self._build()
+        hits: Dict[str, int] = {}
+        for field_name, tree in self._trees.items():
+            value = parse_number(_field_value(listing, field_name))
+            if value is None:
+                continue
+            for query_id in tree.stab(value):
+                hits[query_id] = hits.get(query_id, 0) + 1
+        for field_name, index in self._inverted.items():
+            value = _field_value(listing, field_name)
+            if value is None:
+                continue
+            for query_id in index.get(_norm(value), ()):
+                hits[query_id] = hits.get(query_id, 0) + 1
+
+        queries = self.queries
+        matched = [queries[qid] for qid, count in hits.items() if count == queries[qid].indexed_count]
+        matched.extend(queries[qid] for qid in self._unindexed)
+        return [query for query in matched if query.check_residual(listing)]
+
+    def process(self, listings: Iterable, sink) -> int:
+        """
+        Matches each listing and sends every match to sink.notify(query, listing).
+        Returns the number of notifications the sink accepted.
+        """
+        sent = 0
+        for listing in listings:
+            for query in self.match(listing):
+                if sink.notify(query, listing):
+                    sent += 1
+        return sent
+
+
+####################################################################
+# Notification sinks
+####################################################################
+
+def _listing_dict(listing) -> Dict[str, Any]:
+    return listing if isinstance(listing, dict) else listing.to_dict()
+
+
+def _listing_key(data: Dict[str, Any]) -> str:
+    """
+    Identity of a listing for de-duplication: its URL, or the whole record when
+    the URL is missing or a placeholder like "unknown".
+    """
+    url = data.get("url")
+    if isinstance(url, str) and url.startswith(("http://", "https://")):
+        return url
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, default=str)
+
+
+class ConsoleSink:
+    def notify(self, query: StandingQuery, listing) -> bool:
+        data = _listing_dict(listing)
+        print(f"🔔 [{query.name}] {data.get('manufacturer', '')} {data.get('model', '')} "
+              f"{data.get('price', '')} PLN {data.get('url', '')}")
+        return True
+
+
+class JsonlSink:
+    """
+    Appends alerts to a JSONL file, once per (query, listing).
+    Optionally forwards new alerts to another sink (e.g. ConsoleSink).
+    """
+
+    def __init__(self, path: str = DEFAULT_ALERTS_PATH, forward=None):
+        self.path = path
+        self.forward = forward
+        self._seen = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        alert = json.loads(line)
+                        self._seen.add((alert["query_id"], _listing_key(alert["listing"])))
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def notify(self, query: StandingQuery, listing) -> bool:
+        data = _listing_dict(listing)
+        key = (query.id, _listing_key(data))
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        alert = {"time": int(time.time()), "query_id": query.id, "query_name": query.name, "listing": data}
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(alert, ensure_ascii=False) + "\n")
+        if self.forward is not None:
+            self.forward.notify(query, listing)
+        return True
+
+
+def default_sink(path: str = DEFAULT_ALERTS_PATH) -> JsonlSink:
+    return JsonlSink(path, forward=ConsoleSink())
+
+
+####################################################################
+# CLI
+####################################################################
+
+def _parse_where(expressions: List[str]) -> Dict[str, Any]:
+    """
+    Parses CLI conditions: "ram_size>=8", "price<=1500", "manufacturer=Samsung,Lenovo", "model~tab".
+    """
+    where: Dict[str, Any] = {}
+    for expr in expressions:
+        for op in (">=", "<=", "~", "="):
+            name, sep, value = expr.partition(op)
+            if sep:
+                name = name.strip()
+                if op == ">=":
+                    where.setdefault(name, {})["min"] = float(value)
+                elif op == "<=":
+                    where.setdefault(name, {})["max"] = float(value)
+                elif op == "~":
+                    where[name] = {"contains": value}
+                else:
+                    values = [v.strip() for v in value.split(",")]
+                    # Numeric fields hold floats, so "ram_size=8" must compare numbers
+                    if name in NUMERIC_FIELDS:
+                        values = [float(v) for v in values]
+                    where[name] = values if len(values) > 1 else values[0]
+                break
+        else:
+            raise ValueError(f"Cannot parse condition '{expr}'")
+    return where
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Standing queries / alerts on parsed listings")
+    parser.add_argument("--queries_path", type=str, default=DEFAULT_QUERIES_PATH, help="Saved queries JSON file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_add = sub.add_parser("add", help="Save a query")
+    p_add.add_argument("id", type=str)
+    p_add.add_argument("--name", type=str, default="")
+    p_add.add_argument("--where", type=str, action="append", required=True,
+                       help="Condition like 'ram_size>=8', 'manufacturer=Samsung,Lenovo', 'model~tab' (repeatable)")
+    p_rm = sub.add_parser("remove", help="Delete a query")
+    p_rm.add_argument("id", type=str)
+    sub.add_parser("list", help="Show saved queries")
+    p_match = sub.add_parser("match", help="Match a parsed JSON file against all queries")
+    p_match.add_argument("input_json_path", type=str)
+    p_match.add_argument("--alerts_path", type=str, default=DEFAULT_ALERTS_PATH)
+    args = parser.parse_args()
+
+    engine = StandingQueryEngine.load(args.queries_path)
+    if args.command == "add":
+        engine.add_query(StandingQuery(args.id, _parse_where(args.where), args.name))
+        engine.save(args.queries_path)
+    elif args.command == "remove":
+        engine.remove_query(args.id)
+        engine.save(args.queries_path)
+    elif args.command == "list":
+        for query in engine.queries.values():
+            print(f"{query.id}: {json.dumps(query.where, ensure_ascii=False)}")
+    elif args.command == "match":
+        listings = read_listings_json(args.input_json_path, ParsedListing)
+        sent = engine.process(listings, default_sink(args.alerts_path))
+        print(f"{sent} new alerts written to {args.alerts_path}")
+
+
+if __name__ == "__main__":
+    main()
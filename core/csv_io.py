@@ -0,0 +1,123 @@
+import json
+import csv
+from typing import Any, Dict, List
+from collections.abc import Mapping
+
+from core.listing import listing_type, listings_from_dicts, write_listings_csv
+
+OUTPUT_PATH_BASE = ""
+
+def write_results_to_csv(file_name, data):
+    """
+    Universal CSV writer.
+    Accepts a path to file and a list of data (list of lists or list of dicts).
+
+    - If data is a list of dicts, writes keys as headers.
+    - If data is a list of lists, writes rows as they are.
+    """
+    if not data:
+        raise ValueError("No data to write.")
+
+    full_file_path = OUTPUT_PATH_BASE + file_name
+
+    # Handle list-of-dicts
+    if isinstance(data[0], dict):
+        with open(full_file_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=data[0].keys())
+            writer.writeheader()
+            writer.writerows(data)
+
+    # Handle list-of-lists (first row is the header if there is one)
+    elif isinstance(data[0], (list, tuple)):
+        with open(full_file_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerows(data)
+    else:
+        raise ValueError("Data must be a list of dicts or a list of lists/tuples.")
+
+
+def _flatten(obj: Any, prefix: str = "") -> Dict[str, Any]:
+    """
+    Recursively flatten a nested dict into dot-notated keys.
+    Lists/tuples are converted to JSON strings.
+    Non-dict primitives are returned as-is.
+    """
+    out: Dict[str, Any] = {}
+    if isinstance(obj, Mapping):
+        for k, v in obj.items():
+            key = f"{prefix}.{k}" if prefix else k
+            if isinstance(v, Mapping):
+                out.update(_flatten(v, key))
+            elif isinstance(v, (list, tuple)):
+                # Represent lists as JSON strings (so CSV cell keeps content)
+                out[key] = json.dumps(v, ensure_ascii=False)
+            else:
+                out[key] = v
+    else:
+        # Not a dict (primitive or list) — put it under the prefix key
+        out[prefix] = json.dumps(obj, ensure_ascii=False) if isinstance(obj, (list, tuple)) else obj
+    return out
+
+def json_to_csv(input_file: str, output_file: str, encoding: str = "utf-8") -> int:
+    """
+    Convert a JSON file to CSV.
+
+    - input_file: path to the .json file (root can be a list or single object)
+    - output_file: path to write the .csv file
+    - encoding: file encoding for both read and write (default utf-8)
+
+    Scraped or parsed listing files (core.listing formats) are written by the
+    typed listing writer with its fixed column order; any other JSON is flattened.
+
+    Returns the number of rows written (excluding header).
+    """
+    # Load JSON
+    with open(input_file, "r", encoding=encoding) as f:
+        data = json.load(f)
+
+    # If root is a dict, try to find a list inside; otherwise treat as single record
+    if isinstance(data, Mapping):
+        # find first list value (common case: {"items": [...]})
+        list_value = None
+        for v in data.values():
+            if isinstance(v, list):
+                list_value = v
+                break
+        records: List[Dict[str, Any]]
+        if list_value is not None:
+            records = list_value
+        else:
+            # single object -> one record
+            records = [data]
+    elif isinstance(data, list):
+        records = data
+    else:
+        # primitive at root -> write single row with key "value"
+        records = [{"value": data}]
+
+    cls = listing_type(records)
+    if cls is not None:
+        return write_listings_csv(output_file, listings_from_dicts(records, cls), encoding)
+
+    # Flatten and collect headers
+    flattened: List[Dict[str, Any]] = []
+    fieldnames_set = set()
+    for rec in records:
+        if not isinstance(rec, Mapping):
+            # non-dict entries (e.g., list of strings) -> wrap
+            rec = {"value": rec}
+        flat = _flatten(rec)
+        flattened.append(flat)
+        fieldnames_set.update(flat.keys())
+
+    fieldnames = sorted(fieldnames_set)
+
+    # Write CSV
+    with open(output_file, "w", newline="", encoding=encoding) as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        for row in flattened:
+            # Ensure every field present (DictWriter will fill missing with None -> empty)
+            writer.writerow({k: (row.get(k) if row.get(k) is not None else "") for k in fieldnames})
+
+    return len(flattened)
@@ -0,0 +1,186 @@
+"""
+Shared asyncio fetch engine used by all scraper sources.
+
+One aiohttp session (and connection pool) is shared by every request. The
+engine enforces a global concurrency cap, a per-host concurrency cap and a
+per-host minimum interval between requests (with random jitter, like the
+sleeps of the browser scraper), and retries transient failures.
+
+With a PageCache (core.page_cache) fresh pages are served from disk without
+taking a rate-limit turn, stale ones are revalidated with conditional
+requests, and in offline mode no session is opened at all.
+"""
+import time
+import random
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+MAX_CONCURRENCY = 16
+PER_HOST_CONCURRENCY = 2
+MIN_INTERVAL = 1.0
+JITTER = 1.0
+TIMEOUT = 30
+RETRIES = 2
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36",
+    "Accept-Language": "pl-PL,pl;q=0.9,en;q=0.8",
+}
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    text: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+class _HostLimiter:
+    """
+    Spaces out requests to one host and caps how many run at once.
+    """
+
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.lock = asyncio.Lock()
+        self.next_at = 0.0
+
+    async def wait_turn(self, min_interval: float, jitter: float):
+        async with self.lock:
+            delay = self.next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_at = time.monotonic() + min_interval + random.uniform(0, jitter)
+
+
+class FetchEngine:
+    """
+    Async HTTP fetcher with pooling and rate limits, used as an async context manager:
+
+        async with FetchEngine() as engine:
+            page = await engine.fetch(url)
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, per_host_concurrency: int = PER_HOST_CONCURRENCY,
+                 min_interval: float = MIN_INTERVAL, jitter: float = JITTER, timeout: float = TIMEOUT,
+                 retries: int = RETRIES, headers: Optional[Dict[str, str]] = None, cache=None):
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.timeout = timeout
+        self.retries = retries
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.cache = cache
+        # host -> (min_interval, jitter) set by sources with their own politeness rules
+        self.host_rules: Dict[str, tuple] = {}
+        self._hosts: Dict[str, _HostLimiter] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._session = None
+        self._retry_errors = (asyncio.TimeoutError, OSError)
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.cache is None or not self.cache.offline:
+            self._session = self._open_session()
+        return self
+
+    def _open_session(self):
+        import aiohttp
+
+        self._retry_errors = (asyncio.TimeoutError, OSError, aiohttp.ClientError)
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency, limit_per_host=self.per_host_concurrency, ttl_dns_cache=300
+        )
+        return aiohttp.ClientSession(
+            connector=connector, headers=self.headers, timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    async def __aexit__(self, *exc):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self.cache is not None:
+            self.cache.save_index()
+            print(self.cache.stats())
+
+    def set_host_rule(self, host: str, min_interval: float, jitter: float = 0.0):
+        self.host_rules[host] = (min_interval, jitter)
+
+    def _host(self, host: str) -> _HostLimiter:
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = self._hosts[host] = _HostLimiter(self.per_host_concurrency)
+        return limiter
+
+    async def _request(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        async with self._session.get(url, headers=headers) as resp:
+            text = await resp.text()
+            return FetchResult(url=str(resp.url), status=resp.status, text=text, headers=dict(resp.headers))
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        """
+        Fetches a URL through the page cache (if any), respecting the global and
+        per-host limits. Retries connection errors and retryable statuses with backoff.
+        """
+        cache = self.cache
+        if cache is None:
+            return await self._fetch_network(url, headers)
+
+        entry = cache.get(url)
+        if entry is not None and (cache.offline or cache.is_fresh(entry)):
+            cached = cache.load(entry)
+            if cached is not None:
+                cache.hits += 1
+                return cached
+            entry = None
+        if cache.offline:
+            cache.misses += 1
+            return FetchResult(url=url, status=504, text="")
+
+        if entry is None:
+            result = await self._fetch_network(url, headers)
+        else:
+            result = await self._fetch_network(url, {**(headers or {}), **cache.conditional_headers(entry)})
+            if result.status == 304:
+                # Another task may have evicted the entry while we waited
+                cached = cache.load(entry) if cache.revalidated_ok(entry, result.headers) else None
+                if cached is not None:
+                    cache.revalidated += 1
+                    return cached
+                result = await self._fetch_network(url, headers)
+        cache.misses += 1
+        if result.ok:
+            cache.put(url, result)
+        return result
+
+    async def _fetch_network(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        host = urlsplit(url).netloc
+        limiter = self._host(host)
+        min_interval, jitter = self.host_rules.get(host, (self.min_interval, self.jitter))
+
+        attempt = 0
+        while True:
+            # Wait for the host's turn before taking a global slot, so a slow
+            # host does not hold slots that other hosts could use.
+            async with limiter.semaphore:
+                await limiter.wait_turn(min_interval, jitter)
+                async with self._semaphore:
+                    try:
+                        result = await self._request(url, headers)
+                    except self._retry_errors as e:
+                        if attempt >= self.retries:
+                            raise
+                        print(f"Fetch failed for {url} ({e!r}), retrying.")
+                        result = None
+            if result is not None and (result.status not in RETRY_STATUSES or attempt >= self.retries):
+                return result
+            attempt += 1
+            await asyncio.sleep(min_interval * 2 ** attempt)
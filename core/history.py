@@ -0,0 +1,514 @@
+"""
+Price-history store for tracked OLX listings.
+
+Every scan is appended to the store as one record holding only what changed
+since the previous scan, keyed by OLX ad ID. Records are written to
+append-only segment files in a compact binary encoding:
+
+    segment   := MAGIC record*
+    record    := varint(len(payload)) payload
+    payload   := varint(ts - prev_ts) varint(n_entries) entry*
+    entry     := varint(ad_ref) [str(ad_id) if ad_ref == 0] varint(mask) field*
+
+Prices are stored in grosze as zigzag varint deltas against the previous
+price of the same ad, timestamps as deltas against the previous scan.
+Ad IDs are defined once per segment and then referenced by index, so each
+segment can be decoded on its own. A truncated tail (e.g. after a crash) is
+cut off when the store is opened.
+
+Compaction merges all segments into one, keeping the full price history and
+only the latest value of the text fields.
+"""
+import os
+import sys
+import time
+import bisect
+import argparse
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.listing import RawListing
+
+DEFAULT_HISTORY_PATH = "data/history"
+MAGIC = b"OLXH1\n"
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+MAX_SEGMENTS = 16
+
+# Entry mask bits
+PRICE = 1 << 0
+PRICE_NONE = 1 << 1
+TITLE = 1 << 2
+LOCATION = 1 << 3
+LISTING_TIME = 1 << 4
+URL = 1 << 5
+DESCRIPTION = 1 << 6
+NEGOTIABLE = 1 << 7
+NEGOTIABLE_VALUE = 1 << 8
+
+# Text fields in encoding order: (mask bit, RawListing attribute)
+_TEXT_FIELDS = (
+    (TITLE, "title"),
+    (LOCATION, "location"),
+    (LISTING_TIME, "listing_time"),
+    (URL, "url"),
+    (DESCRIPTION, "description"),
+)
+
+
+####################################################################
+# Encoding helpers
+####################################################################
+
+def _write_varint(buf: bytearray, value: int):
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _read_varint(data, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _write_str(buf: bytearray, value: str):
+    raw = value.encode("utf-8")
+    _write_varint(buf, len(raw))
+    buf += raw
+
+
+def _read_str(data, pos: int) -> Tuple[str, int]:
+    length, pos = _read_varint(data, pos)
+    end = pos + length
+    if end > len(data):
+        raise IndexError("string past end of record")
+    return bytes(data[pos:end]).decode("utf-8"), end
+
+
+def _to_grosze(price: Optional[float]) -> Optional[int]:
+    return None if price is None else int(round(price * 100))
+
+
+class _SegmentWriter:
+    """
+    Appends scan records to one segment file; keeps the per-segment ad table.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.ad_refs: Dict[str, int] = {}
+        self.last_ts = 0
+        self.size = 0
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(MAGIC)
+        self.size = os.path.getsize(path)
+
+    def encode_scan(self, ts: int, entries) -> bytes:
+        """
+        entries: iterable of (ad_id, mask, price_delta, {attr: value}).
+        """
+        payload = bytearray()
+        _write_varint(payload, ts - self.last_ts)
+        entries = list(entries)
+        _write_varint(payload, len(entries))
+        for ad_id, mask, price_delta, texts in entries:
+            ref = self.ad_refs.get(ad_id)
+            if ref is None:
+                _write_varint(payload, 0)
+                _write_str(payload, ad_id)
+                self.ad_refs[ad_id] = len(self.ad_refs) + 1
+            else:
+                _write_varint(payload, ref)
+            _write_varint(payload, mask)
+            if mask & PRICE:
+                _write_varint(payload, _zigzag(price_delta))
+            for bit, attr in _TEXT_FIELDS:
+                if mask & bit:
+                    _write_str(payload, texts[attr])
+        self.last_ts = ts
+        record = bytearray()
+        _write_varint(record, len(payload))
+        return bytes(record + payload)
+
+    def append(self, record: bytes):
+        with open(self.path, "ab") as f:
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        self.size += len(record)
+
+
+class _ListingState:
+    """
+    Latest known state of one ad plus its price series.
+    """
+    __slots__ = ("listing", "grosze", "times", "prices", "first_seen", "last_seen")
+
+    def __init__(self, ad_id: str):
+        self.listing = RawListing(
+            title="", price=None, price_text="", negotiable=False, location="", listing_time="", url="", ad_id=ad_id
+        )
+        self.grosze: Optional[int] = None
+        self.times: List[int] = []
+        self.prices: List[Optional[float]] = []
+        self.first_seen = 0
+        self.last_seen = 0
+
+
+class HistoryStore:
+    """
+    Append-only history of scans, keyed by OLX ad ID.
+
+        store = HistoryStore("data/history")
+        store.record_scan(listings)          # list of RawListing
+        store.price_history("15NSnF")        # [(timestamp, price), ...]
+        store.price_drops()                  # drops in the most recent scan
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, segment_max_bytes: int = SEGMENT_MAX_BYTES,
+                 max_segments: int = MAX_SEGMENTS):
+        self.path = path
+        self.segment_max_bytes = segment_max_bytes
+        self.max_segments = max_segments
+        self.scan_times: List[int] = []
+        self._states: Dict[str, _ListingState] = {}
+        # ad_id -> (old price, new price) for the most recent scan
+        self._last_scan_price_changes: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        self._writer: Optional[_SegmentWriter] = None
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    ####################################################################
+    # Segments
+    ####################################################################
+
+    def _segment_paths(self) -> List[str]:
+        names = sorted(n for n in os.listdir(self.path) if n.startswith("segment-") and n.endswith(".bin"))
+        return [os.path.join(self.path, n) for n in names]
+
+    def _new_segment_path(self) -> str:
+        paths = self._segment_paths()
+        last = int(os.path.basename(paths[-1])[8:-4]) if paths else 0
+        return os.path.join(self.path, f"segment-{last + 1:06d}.bin")
+
+    def _load(self):
+        paths = self._segment_paths()
+        for path in paths:
+            with open(path, "rb") as f:
+                data = f.read()
+            if not data.startswith(MAGIC):
+                raise ValueError(f"Not a history segment: {path}")
+            valid_end, refs, last_ts = self._replay_segment(data)
+            if valid_end < len(data):
+                print(f"History segment {path} has a truncated tail, dropping {len(data) - valid_end} bytes.")
+                with open(path, "r+b") as f:
+                    f.truncate(valid_end)
+        if paths:
+            # Keep appending to the last segment with its own ad table and timestamp base
+            self._writer = _SegmentWriter(paths[-1])
+            self._writer.ad_refs = {ad_id: idx + 1 for idx, ad_id in enumerate(refs)}
+            self._writer.last_ts = last_ts
+
+    def _replay_segment(self, data: bytes) -> Tuple[int, List[str], int]:
+        """
+        Applies every complete record of a segment.
+        Returns (offset after the last valid record, segment ad table, last timestamp).
+        """
+        pos = len(MAGIC)
+        refs: List[str] = []
+        last_ts = 0
+        while pos < len(data):
+            try:
+                length, start = _read_varint(data, pos)
+                end = start + length
+                if end > len(data):
+                    break
+                last_ts = self._apply_record(memoryview(data)[start:end], refs, last_ts)
+            except (IndexError, UnicodeDecodeError):
+                break
+            pos = end
+        return pos, refs, last_ts
+
+    def _apply_record(self, payload, refs: List[str], last_ts: int) -> int:
+        # Decode fully first so a corrupt record leaves the state untouched
+        ts_delta, pos = _read_varint(payload, 0)
+        ts = last_ts + ts_delta
+        count, pos = _read_varint(payload, pos)
+        new_refs = []
+        entries = []
+        for _ in range(count):
+            ref, pos = _read_varint(payload, pos)
+            if ref == 0:
+                ad_id, pos = _read_str(payload, pos)
+                new_refs.append(ad_id)
+            elif ref <= len(refs):
+                ad_id = refs[ref - 1]
+            else:
+                ad_id = new_refs[ref - 1 - len(refs)]
+            mask, pos = _read_varint(payload, pos)
+            price_delta = 0
+            if mask & PRICE:
+                price_delta, pos = _read_varint(payload, pos)
+                price_delta = _unzigzag(price_delta)
+            texts = {}
+            for bit, attr in _TEXT_FIELDS:
+                if mask & bit:
+                    texts[attr], pos = _read_str(payload, pos)
+            entries.append((ad_id, mask, price_delta, texts))
+        if pos != len(payload):
+            raise IndexError("record length mismatch")
+        refs.extend(new_refs)
+        # Scans already covered by a compacted segment are skipped (see compact)
+        if not self.scan_times or ts > self.scan_times[-1]:
+            self._apply_entries(ts, entries)
+        return ts
+
+    ####################################################################
+    # State
+    ####################################################################
+
+    def _apply_entries(self, ts: int, entries):
+        self.scan_times.append(ts)
+        self._last_scan_price_changes = {}
+        for ad_id, mask, price_delta, texts in entries:
+            state = self._states.get(ad_id)
+            if state is None:
+                state = self._states[ad_id] = _ListingState(ad_id)
+                state.first_seen = ts
+            state.last_seen = ts
+            listing = state.listing
+            if mask & (PRICE | PRICE_NONE):
+                old_price = listing.price
+                if mask & PRICE_NONE:
+                    state.grosze = None
+                else:
+                    state.grosze = (state.grosze or 0) + price_delta
+                listing.price = None if state.grosze is None else state.grosze / 100
+                state.times.append(ts)
+                state.prices.append(listing.price)
+                self._last_scan_price_changes[ad_id] = (old_price, listing.price)
+            if mask & NEGOTIABLE:
+                listing.negotiable = bool(mask & NEGOTIABLE_VALUE)
+            for attr, value in texts.items():
+                setattr(listing, attr, value)
+
+    def _diff(self, listing: RawListing):
+        """
+        Returns (mask, price_delta, texts) for what changed in listing, or None.
+        """
+        state = self._states.get(listing.ad_id)
+        grosze = _to_grosze(listing.price)
+        mask = 0
+        price_delta = 0
+        texts = {}
+        if state is None:
+            old_grosze, old, negotiable = None, None, False
+            is_new = True
+        else:
+            old_grosze, old, negotiable = state.grosze, state.listing, state.listing.negotiable
+            is_new = False
+        if grosze is None:
+            if is_new or old_grosze is not None:
+                mask |= PRICE_NONE
+        elif is_new or grosze != old_grosze:
+            mask |= PRICE
+            price_delta = grosze - (old_grosze or 0)
+        if listing.negotiable != negotiable:
+            mask |= NEGOTIABLE
+            if listing.negotiable:
+                mask |= NEGOTIABLE_VALUE
+        for bit, attr in _TEXT_FIELDS:
+            value = getattr(listing, attr)
+            if (is_new and value) or (not is_new and value != getattr(old, attr)):
+                mask |= bit
+                texts[attr] = value
+        if not mask:
+            return None
+        return mask, price_delta, texts
+
+    ####################################################################
+    # Public API
+    ####################################################################
+
+    def record_scan(self, listings: Iterable[RawListing], scanned_at: Optional[int] = None) -> List[str]:
+        """
+        Appends one scan, storing only the fields that changed per ad.
+        Listings may be RawListing records or scraper dicts.
+        Returns the ad IDs that changed (including new ones).
+        """
+        ts = int(scanned_at if scanned_at is not None else time.time())
+        if self.scan_times and ts <= self.scan_times[-1]:
+            if scanned_at is not None:
+                raise ValueError("Scans must be recorded in time order.")
+            # Scan timestamps are unique, two scans within one second get bumped
+            ts = self.scan_times[-1] + 1
+
+        entries = []
+        seen = set()
+        for listing in listings:
+            if isinstance(listing, dict):
+                listing = RawListing.from_dict(listing)
+            if not listing.ad_id or listing.ad_id in seen:
+                continue
+            seen.add(listing.ad_id)
+            diff = self._diff(listing)
+            if diff is not None:
+                entries.append((listing.ad_id, *diff))
+
+        if self._writer is None or self._writer.size >= self.segment_max_bytes:
+            self._writer = _SegmentWriter(self._new_segment_path())
+        self._writer.append(self._writer.encode_scan(ts, entries))
+        self._apply_entries(ts, entries)
+
+        if len(self._segment_paths()) > self.max_segments:
+            self.compact()
+        return [entry[0] for entry in entries]
+
+    def price_history(self, ad_id: str) -> List[Tuple[int, Optional[float]]]:
+        """
+        Returns [(timestamp, price in PLN), ...] for every recorded price change of an ad.
+        """
+        state = self._states.get(ad_id)
+        if state is None:
+            return []
+        return list(zip(state.times, state.prices))
+
+    def price_at(self, ad_id: str, ts: int) -> Optional[float]:
+        """
+        Returns the price an ad had at a given time (None if unknown then).
+        """
+        state = self._states.get(ad_id)
+        if state is None:
+            return None
+        idx = bisect.bisect_right(state.times, ts)
+        return state.prices[idx - 1] if idx else None
+
+    def price_drops(self, since: Optional[int] = None) -> List[Tuple[str, float, float]]:
+        """
+        Returns [(ad_id, old_price, new_price), ...] for ads whose price dropped.
+        Without `since`, compares the most recent scan with the one before it;
+        otherwise compares the price at `since` with the current one.
+        """
+        drops = []
+        if since is None:
+            for ad_id, (old, new) in self._last_scan_price_changes.items():
+                if old is not None and new is not None and new < old:
+                    drops.append((ad_id, old, new))
+            return drops
+        for ad_id, state in self._states.items():
+            if not state.times or state.times[-1] <= since:
+                continue
+            old = self.price_at(ad_id, since)
+            new = state.prices[-1]
+            if old is not None and new is not None and new < old:
+                drops.append((ad_id, old, new))
+        return drops
+
+    def latest(self, ad_id: str) -> Optional[RawListing]:
+        state = self._states.get(ad_id)
+        return state.listing if state else None
+
+    def ad_ids(self) -> List[str]:
+        return list(self._states)
+
+    def compact(self):
+        """
+        Rewrites all segments into one. Price history and scan times are kept,
+        text fields keep only their latest value (written at the ad's first scan).
+        """
+        paths = self._segment_paths()
+        by_ts: Dict[int, list] = {ts: [] for ts in self.scan_times}
+        for ad_id, state in self._states.items():
+            listing = state.listing
+            prev = 0
+            first = True
+            price_points = dict(zip(state.times, state.prices))
+            for ts in sorted(set(state.times) | {state.first_seen}):
+                mask = 0
+                price_delta = 0
+                texts = {}
+                if ts in price_points:
+                    grosze = _to_grosze(price_points[ts])
+                    if grosze is None:
+                        # Replay restarts from 0 after a missing price (see _diff)
+                        mask |= PRICE_NONE
+                        prev = 0
+                    else:
+                        mask |= PRICE
+                        price_delta = grosze - prev
+                        prev = grosze
+                if first:
+                    first = False
+                    if listing.negotiable:
+                        mask |= NEGOTIABLE | NEGOTIABLE_VALUE
+                    for bit, attr in _TEXT_FIELDS:
+                        if getattr(listing, attr):
+                            mask |= bit
+                            texts[attr] = getattr(listing, attr)
+                if mask:
+                    by_ts[ts].append((ad_id, mask, price_delta, texts))
+
+        tmp_path = os.path.join(self.path, "compact.tmp")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        writer = _SegmentWriter(tmp_path)
+        with open(tmp_path, "ab") as f:
+            for ts in sorted(by_ts):
+                f.write(writer.encode_scan(ts, by_ts[ts]))
+            f.flush()
+            os.fsync(f.fileno())
+
+        # The compacted segment atomically replaces the first one. If we crash
+        # before the others are removed, their scans are older than the last
+        # compacted scan and are skipped on replay.
+        new_path = paths[0] if paths else self._new_segment_path()
+        os.replace(tmp_path, new_path)
+        for path in paths[1:]:
+            os.remove(path)
+        writer.path = new_path
+        writer.size = os.path.getsize(new_path)
+        self._writer = writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OLX price history")
+    parser.add_argument("--history_path", type=str, default=DEFAULT_HISTORY_PATH, help="History store directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_hist = sub.add_parser("prices", help="Price history of one listing")
+    p_hist.add_argument("ad_id", type=str, help="OLX ad ID (the part after '-ID' in the URL)")
+    p_drops = sub.add_parser("drops", help="Listings whose price dropped")
+    p_drops.add_argument("--since", type=int, default=None, help="Unix timestamp (default: previous scan)")
+    sub.add_parser("compact", help="Merge all segments into one")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.history_path)
+    if args.command == "prices":
+        for ts, price in store.price_history(args.ad_id):
+            print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(ts))}  {price}")
+    elif args.command == "drops":
+        for ad_id, old, new in store.price_drops(args.since):
+            listing = store.latest(ad_id)
+            print(f"{ad_id}  {old} -> {new}  {listing.title}  {listing.url}")
+    elif args.command == "compact":
+        store.compact()
+        print(f"Compacted {args.history_path}")
+
+
+if __name__ == "__main__":
+    main()
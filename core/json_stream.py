@@ -0,0 +1,103 @@
+"""
+Incremental parser for a JSON array of objects arriving in chunks (e.g. an
+LLM token stream).
+
+feed(chunk) returns every object completed by that chunk, as soon as its
+closing brace arrives, so callers can persist records while the model is
+still generating. Text outside the objects is tolerated: markdown fences,
+<think>...</think> blocks, a missing outer "[" or a truncated tail. A
+malformed object is skipped (and counted) without losing the others.
+"""
+import json
+from typing import Any, Dict, List
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+
+
+class JsonArrayStreamParser:
+    def __init__(self):
+        self.errors = 0
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        # Depth at which records live: 1 inside the outer array, 0 if the model
+        # emits bare objects
+        self._base = None
+        self._start = -1
+        self._in_string = False
+        self._escape = False
+        self._in_think = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self._buf += chunk
+        out = []
+        buf = self._buf
+        i = self._pos
+        n = len(buf)
+        while i < n:
+            if self._in_think:
+                end = buf.find(THINK_CLOSE, i)
+                if end < 0:
+                    # keep a possible partial closing tag for the next chunk
+                    i = max(i, n - len(THINK_CLOSE) + 1)
+                    break
+                self._in_think = False
+                i = end + len(THINK_CLOSE)
+                continue
+
+            c = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                if self._depth > 0:
+                    self._in_string = True
+            elif c == "<" and self._depth == 0:
+                if buf.startswith(THINK_OPEN, i):
+                    self._in_think = True
+                    i += len(THINK_OPEN)
+                    continue
+                if THINK_OPEN.startswith(buf[i:n]):
+                    break  # partial tag, wait for more text
+            elif c in "[{":
+                if self._base is None:
+                    self._base = 1 if c == "[" else 0
+                if c == "{" and self._depth == self._base:
+                    self._start = i
+                self._depth += 1
+            elif c in "]}":
+                if self._depth > 0:
+                    self._depth -= 1
+                    if c == "}" and self._depth == self._base and self._start >= 0:
+                        self._emit(buf[self._start:i + 1], out)
+                        self._start = -1
+            i += 1
+
+        # Drop consumed text, keeping the object currently being built
+        keep = self._start if self._start >= 0 else i
+        self._buf = buf[keep:]
+        self._pos = i - keep
+        if self._start >= 0:
+            self._start = 0
+        return out
+
+    def _emit(self, text: str, out: List[Dict[str, Any]]):
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError:
+            self.errors += 1
+            return
+        if isinstance(obj, dict):
+            out.append(obj)
+
+    @property
+    def pending(self) -> str:
+        """
+        Text of an object that was started but not closed (e.g. a truncated tail).
+        """
+        return self._buf if self._start >= 0 else ""
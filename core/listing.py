@@ -0,0 +1,351 @@
+"""
+Typed listing records shared by the scraper, the parsers and the writers.
+
+RawListing is a scraped OLX ad, ParsedListing is the LLM output for one ad
+(fields follow OUTPUT_SCHEMA in tablets_schema.py). Both use __slots__,
+parse numeric fields once on construction and intern the strings that repeat
+across a history (locations, price texts, listing times, manufacturers,
+conditions).
+
+Serialisation helpers write/read lists of records as JSON, JSONL and CSV;
+the JSON writers also accept plain dicts (output of a custom parsing schema).
+"""
+import re
+import csv
+import sys
+import json
+import math
+from json.encoder import encode_basestring
+from operator import attrgetter
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+_NUMBER_RE = re.compile(r"-?\d+(?:[.,]\d+)?")
+_AD_ID_RE = re.compile(r"-ID([0-9A-Za-z]+)\.html")
+_PRICE_SPACES = str.maketrans("", "", "   ")
+NEGOTIABLE_MARK = "do negocjacji"
+
+
+def _intern(value):
+    if not value:
+        return ""
+    return sys.intern(str(value).strip())
+
+
+def parse_number(value) -> Optional[float]:
+    """
+    Parses a loose number ("8", "8GB", "12,9", 256.0) to float.
+    Returns None for empty or non-numeric values.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER_RE.search(str(value).translate(_PRICE_SPACES))
+    if not match:
+        return None
+    return float(match.group().replace(",", "."))
+
+
+def parse_price(text) -> Optional[float]:
+    """
+    Parses an OLX price string ("4 399 zł", "2 200 zł\\ndo negocjacji") to PLN.
+    Returns None when the ad has no numeric price (e.g. "Za darmo").
+    """
+    if not text:
+        return None
+    return parse_number(str(text).split("\n", 1)[0])
+
+
+def ad_id_from_url(url) -> str:
+    """
+    Extracts the OLX ad ID (the part after "-ID" in the URL), falls back to the URL.
+    """
+    match = _AD_ID_RE.search(url or "")
+    return match.group(1) if match else (url or "")
+
+
+@dataclass(slots=True)
+class RawListing:
+    title: str
+    price: Optional[float]
+    price_text: str
+    negotiable: bool
+    location: str
+    listing_time: str
+    url: str
+    description: str = ""
+    ad_id: str = ""
+
+    @classmethod
+    def from_fields(cls, title, price_text, location_date, url, description=""):
+        """
+        Builds a listing from the strings scraped off a results card.
+        """
+        price_text = price_text or ""
+        location, sep, listing_time = (location_date or "").rpartition(" - ")
+        if not sep:
+            location, listing_time = listing_time, ""
+        return cls(
+            title=title or "",
+            price=parse_price(price_text),
+            price_text=_intern(price_text),
+            negotiable=NEGOTIABLE_MARK in price_text,
+            location=_intern(location),
+            listing_time=_intern(listing_time),
+            url=url or "",
+            description=description or "",
+            ad_id=ad_id_from_url(url),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RawListing":
+        """
+        Accepts the scraper dict format ("Title", "Price", "Location/Date", "URL", "Description").
+        """
+        return cls.from_fields(
+            data.get("Title"), data.get("Price"), data.get("Location/Date"), data.get("URL"), data.get("Description")
+        )
+
+    @property
+    def location_date(self) -> str:
+        if self.location and self.listing_time:
+            return f"{self.location} - {self.listing_time}"
+        return self.location or self.listing_time
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the scraper dict format, so existing JSON files and prompts stay unchanged.
+        """
+        return {
+            "Title": self.title,
+            "Price": self.price_text,
+            "Location/Date": self.location_date,
+            "URL": self.url,
+            "Description": self.description,
+        }
+
+    CSV_HEADER = ("Title", "Price", "Location/Date", "URL", "Description")
+
+    def to_row(self) -> tuple:
+        return (self.title, self.price_text, self.location_date, self.url, self.description)
+
+    @classmethod
+    def from_row(cls, row) -> "RawListing":
+        return cls.from_fields(*row)
+
+
+# Fields of ParsedListing whose values are numbers (parsed once on construction)
+_PARSED_FLOATS = ("ram_size", "storage_size", "screen_size")
+_PARSED_INTS = ("price",)
+_PARSED_INTERNED = ("manufacturer", "device_condition")
+NUMERIC_FIELDS = _PARSED_FLOATS + _PARSED_INTS
+
+
+@dataclass(slots=True)
+class ParsedListing:
+    manufacturer: Optional[str] = None
+    model: Optional[str] = None
+    ram_size: Optional[float] = None
+    storage_size: Optional[float] = None
+    release_date: Optional[str] = None
+    screen_size: Optional[float] = None
+    price: Optional[int] = None
+    device_condition: Optional[str] = None
+    listing_time: Optional[str] = None
+    url: Optional[str] = None
+    # Keys of a custom output schema that are not listing fields
+    extra: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ParsedListing":
+        """
+        Builds a record from LLM output. Numbers given as loose strings are parsed,
+        empty or non-numeric values become None, and so does 0, the "unknown"
+        placeholder the parsing instructions ask for. Unknown keys go to `extra`.
+        """
+        listing = cls()
+        extra = None
+        for key, value in data.items():
+            if key in _FIELD_NAMES:
+                if key in _PARSED_FLOATS:
+                    value = parse_number(value) or None
+                elif key in _PARSED_INTS:
+                    value = parse_number(value)
+                    value = int(round(value)) if value else None
+                elif key in _PARSED_INTERNED:
+                    value = _intern(value) if value is not None else None
+                setattr(listing, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        listing.extra = extra
+        return listing
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the fields that were set (in schema order) followed by `extra`.
+        """
+        out = {name: value for name, value in zip(_FIELD_NAMES, _get_fields(self)) if value is not None}
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    @property
+    def ad_id(self) -> str:
+        return ad_id_from_url(self.url)
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(ParsedListing) if f.name != "extra")
+ParsedListing.CSV_HEADER = _FIELD_NAMES
+_get_fields = attrgetter(*_FIELD_NAMES)
+
+
+def is_parsed_listing_schema(output_schema) -> bool:
+    """
+    True if a parsing output schema has exactly the ParsedListing fields (the
+    tablet OUTPUT_SCHEMA). Other schemas keep their records as plain dicts, so
+    values are not coerced to the listing field types.
+    """
+    try:
+        names = tuple(s["name"] if isinstance(s, dict) else s.name for s in output_schema)
+    except (TypeError, KeyError, AttributeError):
+        return False
+    return names == _FIELD_NAMES
+
+
+def listing_type(records) -> Optional[type]:
+    """
+    Returns RawListing or ParsedListing if every record is a dict in that
+    record's format (keys within its fields, all fields used across the file),
+    else None. Used to send listing files through the typed writers.
+    """
+    if not records or not all(isinstance(rec, dict) for rec in records):
+        return None
+    keys = set().union(*records)
+    for cls, names in ((RawListing, RawListing.CSV_HEADER), (ParsedListing, _FIELD_NAMES)):
+        if keys == set(names):
+            return cls
+    return None
+
+
+def _parsed_row(listing: ParsedListing, header) -> list:
+    row = ["" if value is None else value for value in _get_fields(listing)]
+    for name in header[len(_FIELD_NAMES):]:
+        value = listing.extra.get(name) if listing.extra else None
+        row.append("" if value is None else value)
+    return row
+
+
+####################################################################
+# Serialisation
+####################################################################
+
+def listings_from_dicts(records: Iterable[Dict[str, Any]], cls=RawListing) -> List:
+    return [cls.from_dict(rec) for rec in records]
+
+
+def _as_dict(listing) -> Dict[str, Any]:
+    return listing if isinstance(listing, dict) else listing.to_dict()
+
+
+def write_listings_json(file_path, listings, indent=2):
+    """
+    Writes listings as a JSON array (the format of data/scraped and data/processed).
+    """
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump([_as_dict(l) for l in listings], f, ensure_ascii=False, indent=indent)
+
+
+def read_listings_json(file_path, cls=RawListing) -> List:
+    with open(file_path, encoding="utf-8") as f:
+        return listings_from_dicts(json.load(f), cls)
+
+
+# JSONL lines are built straight from the record fields (no intermediate dict);
+# the output is the same as json.dumps(listing.to_dict(), ensure_ascii=False).
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+_RAW_LINE = "{" + ", ".join(encode_basestring(name) + ": %s" for name in RawListing.CSV_HEADER) + "}\n"
+_PARSED_KEYS = tuple(encode_basestring(name) + ": " for name in _FIELD_NAMES)
+
+
+def _encode_float(value: float) -> str:
+    return float.__repr__(value) if math.isfinite(value) else _encode(value)
+
+
+_ENCODERS = {str: encode_basestring, int: int.__repr__, float: _encode_float}
+
+
+def _raw_line(listing: RawListing) -> str:
+    return _RAW_LINE % tuple(map(encode_basestring, listing.to_row()))
+
+
+def _parsed_line(listing: ParsedListing) -> str:
+    encoders = _ENCODERS
+    parts = [key + encoders.get(value.__class__, _encode)(value)
+             for key, value in zip(_PARSED_KEYS, _get_fields(listing)) if value is not None]
+    if listing.extra:
+        parts.extend(encode_basestring(str(key)) + ": " + _encode(value) for key, value in listing.extra.items())
+    return "{" + ", ".join(parts) + "}\n"
+
+
+def _jsonl_line(listing) -> str:
+    if listing.__class__ is RawListing:
+        return _raw_line(listing)
+    if listing.__class__ is ParsedListing:
+        return _parsed_line(listing)
+    return _encode(_as_dict(listing)) + "\n"
+
+
+def write_listings_jsonl(file_path, listings, append=False):
+    """
+    Writes one listing per line; with append=True new records are added to the end.
+    """
+    with open(file_path, "a" if append else "w", encoding="utf-8") as f:
+        f.writelines(map(_jsonl_line, listings))
+
+
+def iter_listings_jsonl(file_path, cls=RawListing) -> Iterator:
+    loads = json.loads
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield cls.from_dict(loads(line))
+
+
+def read_listings_jsonl(file_path, cls=RawListing) -> List:
+    return list(iter_listings_jsonl(file_path, cls))
+
+
+def write_listings_csv(file_path, listings, encoding="utf-8") -> int:
+    """
+    Writes listings to CSV with a fixed header (extra keys of parsed listings are appended).
+    Returns the number of rows written (excluding header).
+    """
+    listings = list(listings)
+    with open(file_path, "w", newline="", encoding=encoding) as f:
+        writer = csv.writer(f)
+        if listings and isinstance(listings[0], ParsedListing):
+            header = list(_FIELD_NAMES)
+            seen = set(header)
+            for l in listings:
+                for key in (l.extra or ()):
+                    if key not in seen:
+                        seen.add(key)
+                        header.append(key)
+            writer.writerow(header)
+            writer.writerows(_parsed_row(l, header) for l in listings)
+        else:
+            writer.writerow(RawListing.CSV_HEADER)
+            writer.writerows(l.to_row() for l in listings)
+    return len(listings)
+
+
+def read_listings_csv(file_path, cls=RawListing) -> List:
+    with open(file_path, newline="", encoding="utf-8") as f:
+        if cls is RawListing:
+            reader = csv.reader(f)
+            next(reader, None)
+            return [RawListing.from_row(row) for row in reader]
+        return [cls.from_dict({k: v for k, v in row.items() if v != ""}) for row in csv.DictReader(f)]
@@ -0,0 +1,121 @@
+import time
+import random
+
+from core.history import DEFAULT_HISTORY_PATH, HistoryStore
+from core.listing import RawListing, write_listings_json
+from core.page_cache import DEFAULT_TTL, open_cache
+from core.params import as_bool
+from core.scanner import ScanJob, run_scans
+from core.sources.olx import BASE_URL, LOCALISATION_ADDON, NO_LOCALISATION_ADDON
+
+WAIT_TIME = 2
+WAIT_TIME_AD_SHORT = 0.3
+WAIT_TIME_AD_LONG = 0.9
+
+def _start_driver(maximize_window):
+    # Selenium and webdriver_manager are imported here so that importing this
+    # module (e.g. to register tools) does not pull in the browser stack.
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    options = Options()
+    if maximize_window:
+        options.add_argument("--start-maximized")
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+
+def olx_scrape(search_phrase, item_count=10, localisation=True, maximize_window=True, output_path="olx_results.json",
+               history_path=DEFAULT_HISTORY_PATH, use_browser=False, cache_dir=None, offline=False):
+    """
+    Scrapes OLX.pl listings for a search phrase and saves them to a JSON file.
+    By default the "olx" source runs on the shared async fetch engine;
+    use_browser=True drives Chrome through Selenium instead.
+    The scan is also recorded in the price-history store at history_path
+    (pass None or "" to skip it).
+    cache_dir keeps fetched pages in an on-disk page cache (revalidated with
+    conditional requests); offline=True replays the scan from that cache only.
+    The browser path is never cached.
+    A scan is only recorded in the history if its pages are current: offline
+    replays are never recorded, and with history on every cached page is
+    revalidated instead of being served from the cache as is.
+    Flags may be given as bools or "true"/"false" strings.
+    Returns a list of dicts with ad details.
+    """
+    item_count = int(item_count)
+    localisation = as_bool(localisation)
+    maximize_window = as_bool(maximize_window)
+    use_browser = as_bool(use_browser, default=False)
+    offline = as_bool(offline, default=False) and not use_browser
+
+    if use_browser:
+        out = _olx_scrape_browser(search_phrase, item_count, localisation, maximize_window)
+    else:
+        location = LOCALISATION_ADDON if localisation else NO_LOCALISATION_ADDON
+        jobs = [ScanJob("olx", search_phrase, item_count, {"location": location})]
+        # Pages served unrevalidated could be hours old, which would put stale
+        # prices into the history under the current time
+        cache = open_cache(cache_dir, offline, ttl=0 if history_path else DEFAULT_TTL)
+        out = run_scans(jobs, cache=cache)[0]
+
+    if not out:
+        raise ValueError("No data to write.")
+    write_listings_json(output_path, out)
+    if history_path and offline:
+        print("Offline replay, not recording the scan in the price history.")
+    elif history_path:
+        changed = HistoryStore(history_path).record_scan(out)
+        print(f"Recorded scan in {history_path}: {len(changed)} new or changed listings.")
+    return [listing.to_dict() for listing in out]
+
+def _olx_scrape_browser(search_phrase, item_count, localisation, maximize_window):
+    from selenium.webdriver.common.by import By
+
+    driver = _start_driver(maximize_window)
+
+    if localisation:
+        url = f"{BASE_URL}{LOCALISATION_ADDON}/q-{search_phrase}/"
+    else:
+        url = f"{BASE_URL}{NO_LOCALISATION_ADDON}/q-{search_phrase}/"
+
+    driver.get(url)
+    time.sleep(WAIT_TIME)
+
+    ads = driver.find_elements(By.CSS_SELECTOR, "div[data-testid='l-card']")
+    out = []
+    for ad in ads:
+        # Add random timer between each ad
+        time.sleep(random.uniform(1.0, 4.0))  # Random sleep between 1 and 4 seconds
+
+        try:
+            title_el = ad.find_element(By.CSS_SELECTOR, "[data-cy='ad-card-title'] h4")
+            price_el = ad.find_element(By.CSS_SELECTOR, "[data-testid='ad-price']")
+            location_el = ad.find_element(By.CSS_SELECTOR, "[data-testid='location-date']")
+            link_el = ad.find_element(By.CSS_SELECTOR, "a")
+            title = title_el.text.strip()
+            price = price_el.text.strip()
+            location_date = location_el.text.strip()
+            link = link_el.get_attribute("href")
+
+            # Open link in new tab and get description
+            main_window = driver.current_window_handle
+            driver.execute_script("window.open(arguments[0], '_blank');", link)
+            time.sleep(1)
+            driver.switch_to.window(driver.window_handles[-1])
+            time.sleep(WAIT_TIME)
+            try:
+                desc_el = driver.find_element(By.CSS_SELECTOR, "[data-cy='ad_description'] .css-19duwlz")
+                description = desc_el.get_attribute("innerText").strip()
+            except Exception:
+                description = ""
+            driver.close()
+            driver.switch_to.window(main_window)
+
+            out.append(RawListing.from_fields(title, price, location_date, link, description))
+            if len(out) >= item_count:
+                break
+        except Exception as e:
+            continue
+
+    driver.quit()
+    return out
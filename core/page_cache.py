@@ -0,0 +1,221 @@
+"""
+On-disk HTTP page cache for the scraper fetch path (core.fetch.FetchEngine).
+
+Responses are stored per requested URL as gzip-compressed bodies plus an
+index with status, validators (ETag / Last-Modified) and timestamps.
+
+    - fresh entries (younger than ttl) are served without any request,
+    - stale entries are revalidated with If-None-Match / If-Modified-Since,
+      a 304 answer refreshes the entry and serves the cached body,
+    - the cache is kept under max_bytes by evicting least recently used pages,
+    - offline=True serves everything from the cache and never touches the
+      network (misses return status 504), for replaying recorded scans.
+
+The index is written every SAVE_EVERY changes and when the fetch engine
+closes; bodies missing from it (or index entries without a body) after a
+crash are dropped when the cache is opened.
+"""
+import os
+import gzip
+import json
+import time
+import hashlib
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+
+from core.fetch import FetchResult
+from core.params import as_bool
+
+DEFAULT_CACHE_DIR = "data/cache/pages"
+DEFAULT_TTL = 6 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+INDEX_NAME = "index.json"
+BODY_SUFFIX = ".html.gz"
+# Index changes kept in memory before it is rewritten
+SAVE_EVERY = 50
+# Response headers worth keeping with the page
+_KEPT_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    final_url: str
+    status: int
+    headers: Dict[str, str]
+    fetched_at: float
+    last_used: float
+    size: int
+
+    @property
+    def key(self) -> str:
+        return hashlib.sha256(self.url.encode("utf-8")).hexdigest()
+
+
+def _pick_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    lowered = {k.lower(): v for k, v in (headers or {}).items()}
+    return {name: lowered[name.lower()] for name in _KEPT_HEADERS if name.lower() in lowered}
+
+
+class PageCache:
+    def __init__(self, path: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, offline: bool = False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._entries: Dict[str, CacheEntry] = {}
+        self._total = 0
+        self._unsaved = 0
+        os.makedirs(path, exist_ok=True)
+        self._load_index()
+
+    ####################################################################
+    # Index
+    ####################################################################
+
+    def _index_path(self) -> str:
+        return os.path.join(self.path, INDEX_NAME)
+
+    def _body_path(self, entry: CacheEntry) -> str:
+        return os.path.join(self.path, entry.key + BODY_SUFFIX)
+
+    def _load_index(self):
+        if os.path.exists(self._index_path()):
+            with open(self._index_path(), encoding="utf-8") as f:
+                for data in json.load(f):
+                    entry = CacheEntry(**data)
+                    # Bodies removed by hand (or by a crash mid-eviction) are forgotten
+                    if os.path.exists(self._body_path(entry)):
+                        self._entries[entry.url] = entry
+                        self._total += entry.size
+        # Bodies written after the last index save of a crashed run
+        known = {entry.key + BODY_SUFFIX for entry in self._entries.values()}
+        for name in os.listdir(self.path):
+            if name.endswith((BODY_SUFFIX, BODY_SUFFIX + ".tmp")) and name not in known:
+                os.remove(os.path.join(self.path, name))
+
+    def save_index(self):
+        tmp_path = self._index_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump([asdict(e) for e in self._entries.values()], f, ensure_ascii=False)
+        os.replace(tmp_path, self._index_path())
+        self._unsaved = 0
+
+    def _changed(self):
+        self._unsaved += 1
+        if self._unsaved >= SAVE_EVERY:
+            self.save_index()
+
+    ####################################################################
+    # Entries
+    ####################################################################
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        return self._entries.get(url)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.ttl
+
+    def conditional_headers(self, entry: CacheEntry) -> Dict[str, str]:
+        headers = {}
+        if "ETag" in entry.headers:
+            headers["If-None-Match"] = entry.headers["ETag"]
+        if "Last-Modified" in entry.headers:
+            headers["If-Modified-Since"] = entry.headers["Last-Modified"]
+        return headers
+
+    def load(self, entry: CacheEntry) -> Optional[FetchResult]:
+        """
+        Reads a cached page and marks it as recently used.
+        Returns None if the page is no longer cached (e.g. evicted by another task).
+        """
+        if self._entries.get(entry.url) is not entry:
+            return None
+        try:
+            with gzip.open(self._body_path(entry), "rt", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            self._remove(entry)
+            return None
+        entry.last_used = time.time()
+        return FetchResult(url=entry.final_url, status=entry.status, text=text, headers=dict(entry.headers))
+
+    def put(self, url: str, result: FetchResult):
+        old = self._entries.pop(url, None)
+        if old is not None:
+            self._total -= old.size
+        now = time.time()
+        entry = CacheEntry(
+            url=url, final_url=result.url, status=result.status, headers=_pick_headers(result.headers),
+            fetched_at=now, last_used=now, size=0,
+        )
+        body_path = self._body_path(entry)
+        with gzip.open(body_path + ".tmp", "wt", encoding="utf-8", compresslevel=5) as f:
+            f.write(result.text)
+        os.replace(body_path + ".tmp", body_path)
+        entry.size = os.path.getsize(body_path)
+        self._entries[url] = entry
+        self._total += entry.size
+        self._evict()
+        self._changed()
+
+    def revalidated_ok(self, entry: CacheEntry, headers: Dict[str, str]) -> bool:
+        """
+        Called on a 304 answer: the cached body is current again.
+        Returns False if the entry was evicted while the request was in flight.
+        """
+        if self._entries.get(entry.url) is not entry:
+            return False
+        entry.fetched_at = time.time()
+        entry.headers.update(_pick_headers(headers))
+        self._changed()
+        return True
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+        for entry in sorted(self._entries.values(), key=lambda e: e.last_used):
+            if self._total <= self.max_bytes:
+                break
+            self._remove(entry)
+
+    def _remove(self, entry: CacheEntry):
+        if self._entries.get(entry.url) is not entry:
+            return
+        del self._entries[entry.url]
+        self._total -= entry.size
+        try:
+            os.remove(self._body_path(entry))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for entry in list(self._entries.values()):
+            self._remove(entry)
+        self.save_index()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> str:
+        return (f"page cache: {self.hits} hits, {self.revalidated} revalidated, {self.misses} misses, "
+                f"{len(self)} pages / {self._total / 1024 / 1024:.1f} MB")
+
+
+def open_cache(cache_dir: Optional[str] = None, offline=False, ttl: float = DEFAULT_TTL) -> Optional[PageCache]:
+    """
+    PageCache for the scraper entry points: None (no caching) unless a
+    cache_dir is given or offline replay is asked for.
+    """
+    offline = as_bool(offline, default=False)
+    if not cache_dir and not offline:
+        return None
+    return PageCache(cache_dir or DEFAULT_CACHE_DIR, ttl=ttl, offline=offline)
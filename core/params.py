@@ -0,0 +1,39 @@
+import json
+import functools
+import inspect
+
+
+def load_json_params(json_params):
+    """
+    Accepts parameters as a JSON string or dict and returns a dict.
+    """
+    if isinstance(json_params, str):
+        json_params = json.loads(json_params)
+    return dict(json_params or {})
+
+
+def as_bool(value, default=True):
+    """
+    Converts a flag that may come as str (from CLI or LLM) to bool.
+    """
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() == "true"
+    return bool(value)
+
+
+def json_params_fn(fn):
+    """
+    Wraps a keyword-argument function so it accepts a single JSON string or dict
+    of its parameters (the call style used by the LangChain agents).
+    Unknown keys are ignored, missing ones fall back to the function defaults.
+    """
+    accepted = set(inspect.signature(fn).parameters)
+
+    @functools.wraps(fn)
+    def wrapper(json_params):
+        params = load_json_params(json_params)
+        return fn(**{k: v for k, v in params.items() if k in accepted})
+
+    return wrapper
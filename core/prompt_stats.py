@@ -0,0 +1,59 @@
+"""
+Per-row prompt evaluation statistics reported by Ollama.
+
+Ollama returns prompt_eval_count / prompt_eval_duration (ns) with every
+generation. Tokens served from the prompt (KV) cache are not evaluated again,
+so with a cache-friendly prompt layout both numbers drop after the first row.
+"""
+import json
+import time
+import statistics
+from typing import Any, Dict, List, Optional
+
+
+class PromptEvalStats:
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.rows: List[Dict[str, Any]] = []
+
+    def add(self, generation_info: Optional[Dict[str, Any]], wall_time: float):
+        """
+        Records one generation. generation_info is the dict LangChain's Ollama
+        LLM attaches to a generation (may be None for other backends).
+        """
+        info = generation_info or {}
+        row = {
+            "prompt_tokens": info.get("prompt_eval_count"),
+            "prompt_eval_ms": info["prompt_eval_duration"] / 1e6 if info.get("prompt_eval_duration") else None,
+            "eval_ms": info["eval_duration"] / 1e6 if info.get("eval_duration") else None,
+            "wall_ms": wall_time * 1000,
+        }
+        self.rows.append(row)
+        return row
+
+    def format_row(self, row: Dict[str, Any]) -> str:
+        if row["prompt_eval_ms"] is None:
+            return f"wall {row['wall_ms']:.0f} ms"
+        return (f"prompt eval {row['prompt_eval_ms']:.0f} ms ({row['prompt_tokens']} tokens), "
+                f"generation {row['eval_ms']:.0f} ms")
+
+    def summary(self) -> Dict[str, Any]:
+        def mean(key, rows):
+            values = [r[key] for r in rows if r[key] is not None]
+            return round(statistics.mean(values), 1) if values else None
+
+        # The first row fills the cache, the rest show the steady state
+        rest = self.rows[1:]
+        return {
+            "label": self.label,
+            "rows": len(self.rows),
+            "first_prompt_eval_ms": self.rows[0]["prompt_eval_ms"] if self.rows else None,
+            "mean_prompt_eval_ms": mean("prompt_eval_ms", self.rows),
+            "mean_prompt_eval_ms_after_first": mean("prompt_eval_ms", rest),
+            "mean_prompt_tokens_after_first": mean("prompt_tokens", rest),
+            "mean_wall_ms": mean("wall_ms", self.rows),
+        }
+
+    def append_to(self, path: str):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"timestamp": int(time.time()), **self.summary()}) + "\n")
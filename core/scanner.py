@@ -0,0 +1,133 @@
+"""
+Runs scraper sources on one shared FetchEngine.
+
+All jobs run concurrently on the same event loop and connection pool, so a
+scan over many sources takes roughly as long as the slowest one; the
+engine's per-host limits keep each site's request rate polite.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from core.fetch import FetchEngine
+from core.sources import get_source
+
+
+@dataclass
+class ScanJob:
+    source: str
+    query: str
+    limit: int = 10
+    # Values for the source's search URL template (e.g. {"location": "/oferty"})
+    params: Dict[str, str] = field(default_factory=dict)
+    with_details: bool = True
+
+
+async def _as_is(item: Dict[str, str]) -> Dict[str, str]:
+    return item
+
+
+async def _with_detail(engine: FetchEngine, source, item: Dict[str, str]) -> Dict[str, str]:
+    url = item.get(source.detail_url_field)
+    if not url:
+        return item
+    try:
+        page = await engine.fetch(url)
+    except Exception as e:
+        print(f"[{source.name}] Detail page failed for {url}: {e!r}")
+        return item
+    if not page.ok:
+        print(f"[{source.name}] Detail page {url} returned {page.status}")
+        return item
+    return {**item, **source.parse_detail_page(page.text, page.url)}
+
+
+async def scan_source(engine: FetchEngine, job: ScanJob) -> List[Any]:
+    """
+    Walks the result pages of one source until `limit` items are found or the
+    pages run out. Detail pages are fetched concurrently while pagination goes on.
+    Returns the source's records in result order.
+    """
+    source = get_source(job.source)
+    first_url = source.search_page_url(job.query, source.first_page, **job.params)
+    engine.set_host_rule(urlsplit(first_url).netloc, source.min_interval, source.jitter)
+
+    seen = set()
+    tasks = []
+    page_no = source.first_page
+    url = first_url
+    try:
+        for _ in range(source.max_pages):
+            page = await engine.fetch(url)
+            if not page.ok:
+                print(f"[{source.name}] {url} returned {page.status}, stopping.")
+                break
+            new_items = 0
+            for item in source.parse_page(page.text, page.url):
+                key = item.get(source.detail_url_field or "url") or tuple(item.values())
+                if key in seen:
+                    continue
+                seen.add(key)
+                new_items += 1
+                if job.with_details and source.detail_url_field:
+                    tasks.append(asyncio.ensure_future(_with_detail(engine, source, item)))
+                else:
+                    tasks.append(asyncio.ensure_future(_as_is(item)))
+                if len(tasks) >= job.limit:
+                    break
+            # An empty or fully repeated page means we ran past the last one
+            if len(tasks) >= job.limit or not new_items:
+                break
+            if source.next_page_selector:
+                url = source.next_page_url(page.text, page.url)
+                if not url:
+                    break
+            else:
+                page_no += 1
+                url = source.search_page_url(job.query, page_no, **job.params)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    items = await asyncio.gather(*tasks)
+    return [source.record(item) for item in items]
+
+
+async def scan_sources(jobs: List[ScanJob], engine: Optional[FetchEngine] = None) -> List[List[Any]]:
+    """
+    Runs all jobs concurrently on one engine. Returns one record list per job;
+    a failing job returns an empty list instead of cancelling the others.
+    If every job fails (e.g. a single job, or a missing dependency) the first
+    error is raised instead, so callers see the real cause.
+    """
+    errors = []
+
+    async def run(job, engine):
+        try:
+            return await scan_source(engine, job)
+        except Exception as e:
+            print(f"[{job.source}] Scan for '{job.query}' failed: {e!r}")
+            errors.append(e)
+            return []
+
+    if engine is not None:
+        results = await asyncio.gather(*(run(job, engine) for job in jobs))
+    else:
+        async with FetchEngine() as engine:
+            results = await asyncio.gather(*(run(job, engine) for job in jobs))
+    if jobs and len(errors) == len(jobs):
+        raise errors[0]
+    return results
+
+
+def run_scans(jobs: List[ScanJob], **engine_options) -> List[List[Any]]:
+    """
+    Synchronous entry point: runs the jobs on a new FetchEngine(**engine_options).
+    """
+    async def main():
+        async with FetchEngine(**engine_options) as engine:
+            return await scan_sources(jobs, engine)
+
+    return asyncio.run(main())
@@ -0,0 +1,35 @@
+"""
+Registry of scraper sources.
+
+Built-in sources live in modules listed in BUILTIN_SOURCES and are imported
+on first lookup. New sites are added by writing a Source (see base.py) and
+either listing its module here or calling register_source().
+"""
+import importlib
+from typing import Dict, List
+
+from core.sources.base import Source
+
+# source name -> "module:attribute"
+BUILTIN_SOURCES = {
+    "olx": "core.sources.olx:OLX",
+}
+
+_sources: Dict[str, Source] = {}
+
+
+def register_source(source: Source):
+    _sources[source.name] = source
+
+
+def get_source(name: str) -> Source:
+    if name not in _sources:
+        if name not in BUILTIN_SOURCES:
+            raise ValueError(f"Unknown source '{name}'. Available: {', '.join(available_sources())}")
+        module_name, attr = BUILTIN_SOURCES[name].split(":")
+        register_source(getattr(importlib.import_module(module_name), attr))
+    return _sources[name]
+
+
+def available_sources() -> List[str]:
+    return sorted(set(BUILTIN_SOURCES) | set(_sources))
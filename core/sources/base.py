@@ -0,0 +1,103 @@
+"""
+Declarative description of a scraper source.
+
+A Source says how to build a search URL, how to pull items out of a results
+page (CSS selectors or a parse function), how to paginate, and optionally
+which fields to read from each item's detail page. Fetching is done by the
+shared FetchEngine (see core.scanner), never by the source itself.
+
+Selector specs:
+    "css"            -> stripped text of the first match
+    "css@attr"       -> attribute of the first match (URLs are made absolute)
+    ["css1", "css2"] -> first spec that matches
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Union
+from urllib.parse import quote_plus, urljoin
+
+Selector = Union[str, List[str]]
+
+
+def _soup(html: str):
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, "html.parser")
+
+
+def select_value(node, spec: Selector, base_url: str = "") -> str:
+    """
+    Applies a selector spec to a BeautifulSoup node, returns "" when nothing matches.
+    """
+    specs = [spec] if isinstance(spec, str) else spec
+    for one in specs:
+        css, _, attr = one.partition("@")
+        el = node.select_one(css) if css else node
+        if el is None:
+            continue
+        if attr:
+            value = el.get(attr)
+            if not value:
+                continue
+            return urljoin(base_url, value) if attr in ("href", "src") else value
+        return el.get_text("\n", strip=True)
+    return ""
+
+
+@dataclass
+class Source:
+    name: str
+    # Template with {query}, {page} and any key of params
+    search_url: str
+    params: Dict[str, str] = field(default_factory=dict)
+    query_format: Callable[[str], str] = quote_plus
+
+    # Results page: either item_selector + fields, or parse_results(html, page_url) -> [dict]
+    item_selector: str = ""
+    fields: Dict[str, Selector] = field(default_factory=dict)
+    parse_results: Optional[Callable[[str, str], List[Dict[str, str]]]] = None
+
+    # Detail page (optional): item[detail_url_field] is fetched and parsed
+    detail_url_field: Optional[str] = None
+    detail_fields: Dict[str, Selector] = field(default_factory=dict)
+    parse_detail: Optional[Callable[[str, str], Dict[str, str]]] = None
+
+    # Pagination: follow next_page_selector if set, otherwise number pages from first_page
+    first_page: int = 1
+    max_pages: int = 1
+    next_page_selector: Optional[str] = None
+
+    # Politeness rules for the source's host
+    min_interval: float = 1.0
+    jitter: float = 1.0
+
+    # Turns an item dict (results + detail fields) into the record returned by scans
+    make_record: Optional[Callable[[Dict[str, str]], Any]] = None
+
+    def search_page_url(self, query: str, page: int, **params) -> str:
+        values = {**self.params, **params}
+        return self.search_url.format(query=self.query_format(query), page=page, **values)
+
+    def parse_page(self, html: str, page_url: str) -> List[Dict[str, str]]:
+        if self.parse_results is not None:
+            return self.parse_results(html, page_url)
+        soup = _soup(html)
+        items = []
+        for node in soup.select(self.item_selector):
+            item = {name: select_value(node, spec, page_url) for name, spec in self.fields.items()}
+            if any(item.values()):
+                items.append(item)
+        return items
+
+    def next_page_url(self, html: str, page_url: str) -> str:
+        if not self.next_page_selector:
+            return ""
+        return select_value(_soup(html), self.next_page_selector + "@href", page_url)
+
+    def parse_detail_page(self, html: str, page_url: str) -> Dict[str, str]:
+        if self.parse_detail is not None:
+            return self.parse_detail(html, page_url)
+        soup = _soup(html)
+        return {name: select_value(soup, spec, page_url) for name, spec in self.detail_fields.items()}
+
+    def record(self, item: Dict[str, str]):
+        return self.make_record(item) if self.make_record else item
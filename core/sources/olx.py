@@ -0,0 +1,42 @@
+from urllib.parse import quote
+
+from core.listing import RawListing
+from core.sources.base import Source
+
+BASE_URL = "https://www.olx.pl"
+LOCALISATION_ADDON = "/gdansk"
+NO_LOCALISATION_ADDON = "/oferty"
+
+
+def _olx_query(query: str) -> str:
+    # OLX puts the phrase in the path with words joined by dashes
+    return quote("-".join(query.split()))
+
+
+def _olx_record(item):
+    return RawListing.from_fields(
+        item.get("title"), item.get("price"), item.get("location_date"), item.get("url"), item.get("description")
+    )
+
+
+OLX = Source(
+    name="olx",
+    search_url=BASE_URL + "{location}/q-{query}/?page={page}",
+    params={"location": LOCALISATION_ADDON},
+    query_format=_olx_query,
+    item_selector="div[data-testid='l-card']",
+    fields={
+        "title": ["[data-cy='ad-card-title'] h4", "[data-cy='ad-card-title'] h6", "h4", "h6"],
+        "price": "[data-testid='ad-price']",
+        "location_date": "[data-testid='location-date']",
+        "url": "a@href",
+    },
+    detail_url_field="url",
+    detail_fields={
+        "description": ["[data-cy='ad_description'] .css-19duwlz", "[data-cy='ad_description'] div", "[data-cy='ad_description']"],
+    },
+    max_pages=25,
+    min_interval=1.0,
+    jitter=3.0,
+    make_record=_olx_record,
+)
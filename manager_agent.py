@@ -2,19 +2,16 @@ from langchain.llms import Ollama
 from langchain.agents import initialize_agent
 from langchain.agents import AgentType
 
-from scraping_scripts.olx_scrape_fn_json import scraper_site_olx_json
-from utils.json_writer_2 import json_writer
-from utils.json_to_csv_2 import json_to_csv_tool
-from parsing_agent_2 import parse_json_tool
+from tool_registry import get_tools
 
 llm = Ollama(model="qwen3:8b")
 
-tools = [
-    scraper_site_olx_json,
-    json_writer,
-    json_to_csv_tool,
-    parse_json_tool
-]
+tools = get_tools(
+    "olx_scraper_json",
+    "json_writer_json",
+    "json_to_csv_json",
+    "parse_json_json"
+)
 
 manager_agent = initialize_agent(
     tools=tools,
@@ -1,63 +1,124 @@
 import json
-from langchain.output_parsers import StructuredOutputParser
-from langchain.prompts import PromptTemplate
-from langchain_community.llms import Ollama
+import time
+
+from core.alerts import DEFAULT_QUERIES_PATH, StandingQueryEngine, default_sink
+from core.listing import ParsedListing, is_parsed_listing_schema, write_listings_json
+from core.prompt_stats import PromptEvalStats
+from tool_registry import lazy_tool_attrs
 
 MODEL_NAME = "qwen3:8b"
+# Keep the model (and its prompt cache) loaded between rows and runs
+KEEP_ALIVE = "30m"
+
+# "prefix": static instructions first and the row last, so every row shares the
+# same prompt prefix and Ollama reuses its KV cache instead of re-encoding the
+# schema instructions. "input_first": the original layout, kept for comparison.
+PROMPT_LAYOUTS = ("prefix", "input_first")
+DEFAULT_PROMPT_LAYOUT = "prefix"
+
+PROMPT_HEADER = """
+        You are a strict data parsing assistant.
+"""
+PROMPT_INSTRUCTIONS = """
+        {dynamic_instructions}
+
+        Only return JSON{output_kind} that matches the following rules and fields:
+        {format_instructions}
+        Do not return any other text or explanations.
+"""
+PROMPT_INPUT = """        Input{input_kind}: {input_data}
+"""
 
-def parse_json_file(input_json_path, output_json_path, output_schema, dynamic_instructions=""):
+def build_prompt(format_instructions, dynamic_instructions="", layout=DEFAULT_PROMPT_LAYOUT, bulk=False):
+    """
+    Builds the parsing PromptTemplate; only {input_data} is left to fill per call.
+    With the "prefix" layout everything before the input is identical for all rows.
+    """
+    from langchain.prompts import PromptTemplate
+
+    if layout not in PROMPT_LAYOUTS:
+        raise ValueError(f"Unknown prompt layout '{layout}'. Use one of: {', '.join(PROMPT_LAYOUTS)}")
+    if layout == "prefix":
+        template = PROMPT_HEADER + PROMPT_INSTRUCTIONS + "\n" + PROMPT_INPUT
+    else:
+        template = PROMPT_HEADER + PROMPT_INPUT + PROMPT_INSTRUCTIONS
+    return PromptTemplate(
+        template=template,
+        input_variables=["input_data"],
+        partial_variables={
+            "format_instructions": format_instructions,
+            "dynamic_instructions": dynamic_instructions,
+            "output_kind": " (list of objects)" if bulk else "",
+            "input_kind": " (list of records)" if bulk else "",
+        }
+    )
+
+def generate(llm, llm_input, stats=None):
+    """
+    Runs one generation and returns its text; records prompt-eval timings in stats.
+    """
+    start = time.perf_counter()
+    generation = llm.generate([llm_input]).generations[0][0]
+    if stats is not None:
+        row = stats.add(generation.generation_info, time.perf_counter() - start)
+        print(f"  {stats.format_row(row)}")
+    return generation.text
+
+def parse_json_file(input_json_path, output_json_path, output_schema, dynamic_instructions="",
+                    queries_path=DEFAULT_QUERIES_PATH, prompt_layout=DEFAULT_PROMPT_LAYOUT, stats_path=None):
     """
     Parsing agent that runs locally with LangChain & Ollama.
     Dynamically builds parsing prompt and parses each row of a JSON file.
     Updates output JSON file every time a new item is processed.
+    Items of the tablet OUTPUT_SCHEMA are kept as ParsedListing records, other
+    schemas keep the model's values as they are.
+    Each parsed item is matched against the saved alert queries in queries_path.
+    Prompt-eval time per row is printed; with stats_path set, the run summary is
+    appended there (JSONL) to compare prompt layouts.
+    Returns parsed data as a list of dicts.
     """
+    from langchain.output_parsers import StructuredOutputParser
+    from langchain_community.llms import Ollama
 
-    llm = Ollama(model=MODEL_NAME)
+    llm = Ollama(model=MODEL_NAME, keep_alive=KEEP_ALIVE)
     output_parser = StructuredOutputParser.from_response_schemas(output_schema)
     format_instructions = output_parser.get_format_instructions()
+    prompt = build_prompt(format_instructions, dynamic_instructions, prompt_layout)
+    stats = PromptEvalStats(label=prompt_layout)
+    typed = is_parsed_listing_schema(output_schema)
 
-    prompt = PromptTemplate(
-        template="""
-        You are a strict data parsing assistant.
-        Input: {input_data}
-
-        {dynamic_instructions}
-
-        Only return JSON that matches the following rules and fields:
-        {format_instructions}
-        Do not return any other text or explanations.
-        """,
-        input_variables=["input_data", "dynamic_instructions"],
-        partial_variables={"format_instructions": format_instructions}
-    )
+    alerts = StandingQueryEngine.load(queries_path) if queries_path else StandingQueryEngine()
+    sink = default_sink() if alerts.queries else None
 
     results = []
     with open(input_json_path, encoding="utf-8") as f:
         data = json.load(f)
         for idx, row in enumerate(data):
-            llm_input = prompt.format(input_data=row, dynamic_instructions=dynamic_instructions)
+            llm_input = prompt.format(input_data=row)
             print(f"Processing row {idx + 1}/{len(data)}")
 
-            raw_output = llm(llm_input)
+            raw_output = generate(llm, llm_input, stats)
             try:
                 parsed_output = output_parser.parse(raw_output)
-                results.append(parsed_output)
+                listing = ParsedListing.from_dict(parsed_output) if typed else parsed_output
+                results.append(listing)
             except Exception as e:
                 print(f"Parsing failed for row: {row}")
                 print("Raw output was:\n", raw_output)
                 continue
 
             # Update output file after each item
-            with open(output_json_path, "w", encoding="utf-8") as out_f:
-                json.dump(results, out_f, ensure_ascii=False, indent=2)
+            write_listings_json(output_json_path, results)
             print(f"Updated {output_json_path} with {len(results)} items.")
+            if sink is not None:
+                alerts.process([listing], sink)
 
     print(f"Finished. Parsed {len(results)} rows, saved to {output_json_path}")
+    print(f"Prompt eval: {stats.summary()}")
+    if stats_path:
+        stats.append_to(stats_path)
+    return [listing.to_dict() if typed else listing for listing in results]
 
 
-from langchain.tools import Tool
-parse_json_tool = Tool(
-    name="parse_json_file_for_items",
-    func=parse_json_file,
-    description="Parses a JSON file using a specified schema. Parameters: input_json_path (str), output_json_path (str), output_schema (dict), dynamic_instructions (str). Returns parsed data as a list of dictionaries."
-)
\ No newline at end of file
+# LangChain Tool is built on first access
+__getattr__ = lazy_tool_attrs(__name__, {"parse_json_tool": "parse_json"})
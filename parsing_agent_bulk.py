@@ -1,50 +1,205 @@
+import os
 import json
-from langchain.output_parsers import StructuredOutputParser
-from langchain.prompts import PromptTemplate
-from langchain_community.llms import Ollama
+import time
+import hashlib
+
+from core.alerts import DEFAULT_QUERIES_PATH, StandingQueryEngine, default_sink
+from core.json_stream import JsonArrayStreamParser
+from core.listing import ParsedListing, is_parsed_listing_schema, write_listings_json
+from parsing_agent import DEFAULT_PROMPT_LAYOUT, KEEP_ALIVE, build_prompt
 
 MODEL_NAME = "qwen3:8b"
+# How many times rows missing from the output (truncated or malformed generation) are re-sent
+MAX_ATTEMPTS = 3
+
+def _row_url(row):
+    return row.get("URL") or row.get("url") if isinstance(row, dict) else None
+
+def stream_records(llm, llm_input):
+    """
+    Streams the LLM output through an incremental JSON array parser and yields
+    each record as soon as its closing brace arrives.
+    """
+    parser = JsonArrayStreamParser()
+    for chunk in llm.stream(llm_input):
+        yield from parser.feed(chunk)
+    if parser.pending:
+        print(f"Output was truncated inside a record ({len(parser.pending)} chars dropped).")
+    if parser.errors:
+        print(f"Skipped {parser.errors} malformed records.")
+
+def input_fingerprint(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+def _partial_header(fingerprint, row_count):
+    return {"input": fingerprint, "rows": row_count}
 
-def parse_json_file(input_json_path, output_json_path, output_schema, dynamic_instructions=""):
+def _load_partial(partial_path, fingerprint, row_count):
+    """
+    Returns {row index: record dict} from a previous run's sidecar, if it was
+    written for the same input (content hash and row count); otherwise {}.
+    Unreadable lines (e.g. the cut-off last line of a crashed run) are skipped.
+    """
+    if not os.path.exists(partial_path):
+        return {}
+    done = {}
+    with open(partial_path, encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError:
+            return {}
+        if header != _partial_header(fingerprint, row_count):
+            return {}
+        for line in f:
+            try:
+                entry = json.loads(line)
+                idx = entry["row"]
+                if 0 <= idx < row_count:
+                    done[idx] = entry["record"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+    return done
+
+def _write_partial(partial_path, fingerprint, row_count, done):
+    with open(partial_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(_partial_header(fingerprint, row_count)) + "\n")
+        for idx, record in done.items():
+            f.write(json.dumps({"row": idx, "record": record}, ensure_ascii=False) + "\n")
+
+def _append_partial(partial_path, idx, record):
+    with open(partial_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"row": idx, "record": record}, ensure_ascii=False) + "\n")
+
+def parse_rows(llm, prompt, data, partial_path, fingerprint, typed=True, on_record=None,
+               batch_size=None, max_attempts=MAX_ATTEMPTS):
+    """
+    Parses the input rows with streamed bulk generations; the LLM-independent
+    part of parse_json_file.
+
+    Every input row gets at most one record. A record whose URL belongs to an
+    input row fills that row, or is dropped if the row already has a record or
+    was not part of the request. A record whose URL matches no input row (the
+    model changed or dropped it) fills the row at its position in the request.
+    Only rows without a record are sent again, up to max_attempts times per batch.
+
+    Progress is kept in partial_path (see parse_json_file); a sidecar for the
+    same input is resumed. on_record(listing) is called once per filled row.
+    Returns (one record or None per input row, indices of the rows given up on).
+    """
+    parsed = [None] * len(data)
+    done = _load_partial(partial_path, fingerprint, len(data))
+    for idx, record in done.items():
+        parsed[idx] = ParsedListing.from_dict(record) if typed else record
+    if done:
+        print(f"Resuming from {partial_path}: {len(done)}/{len(data)} rows already parsed.")
+    # Rewritten so a cut-off last line does not swallow the next append
+    _write_partial(partial_path, fingerprint, len(data), done)
+
+    row_by_url = {}
+    for idx, row in enumerate(data):
+        row_by_url.setdefault(_row_url(row), idx)
+    row_by_url.pop(None, None)
+
+    todo = [idx for idx in range(len(data)) if parsed[idx] is None]
+    size = batch_size or len(todo) or 1
+    batches = [todo[i:i + size] for i in range(0, len(todo), size)]
+    failed_rows = []
+    start = time.perf_counter()
+    first_record_at = None
+
+    for batch_no, batch in enumerate(batches, start=1):
+        for attempt in range(1, max_attempts + 1):
+            llm_input = prompt.format(input_data=json.dumps([data[idx] for idx in batch], ensure_ascii=False))
+            print(f"Batch {batch_no}/{len(batches)}, attempt {attempt}: {len(batch)} rows")
+
+            sent = set(batch)
+            got = 0
+            try:
+                for record in stream_records(llm, llm_input):
+                    position = got
+                    got += 1
+                    listing = ParsedListing.from_dict(record) if typed else record
+                    url = listing.url if typed else record.get("url")
+                    idx = row_by_url.get(url) if isinstance(url, str) else None
+                    if idx is not None:
+                        if idx not in sent or parsed[idx] is not None:
+                            print(f"Duplicate or unexpected record for {url}, skipped.")
+                            continue
+                    else:
+                        # The model changed or dropped the URL: take the row at this position
+                        idx = batch[position] if position < len(batch) else None
+                        if idx is None or parsed[idx] is not None:
+                            idx = next((i for i in batch if parsed[i] is None), None)
+                        if idx is None:
+                            print("Extra record with no input row left, skipped.")
+                            continue
+                    parsed[idx] = listing
+                    _append_partial(partial_path, idx, listing.to_dict() if typed else listing)
+                    if first_record_at is None:
+                        first_record_at = time.perf_counter() - start
+                        print(f"First record after {first_record_at:.1f} s")
+                    if on_record is not None:
+                        on_record(listing)
+            except Exception as e:
+                print(f"Generation failed after {got} records: {e!r}")
+
+            # Re-queue only the rows that have no record yet
+            batch = [idx for idx in batch if parsed[idx] is None]
+            if not batch:
+                break
+            print(f"{len(batch)} rows missing from the output, re-queueing.")
+        failed_rows.extend(batch)
+    return parsed, failed_rows
+
+def parse_json_file(input_json_path, output_json_path, output_schema, dynamic_instructions="",
+                    queries_path=DEFAULT_QUERIES_PATH, prompt_layout=DEFAULT_PROMPT_LAYOUT,
+                    batch_size=None, max_attempts=MAX_ATTEMPTS):
     """
     Parsing agent that runs locally with LangChain & Ollama.
-    Dynamically builds parsing prompt and parses the whole JSON file in one LLM call.
+    Dynamically builds parsing prompt and parses the whole JSON file in one LLM call
+    (or in batches of batch_size rows).
+    The output is streamed and every input row gets at most one record (see
+    parse_rows); rows missing from the output are sent again, up to
+    max_attempts times per batch.
+    Each record is appended to <output_json_path>.partial.jsonl as soon as it is
+    complete. If a run crashes, the next run on the same input (same content)
+    resumes from that file and only sends the rows that are still missing; the
+    file is removed once every row is parsed.
+    Items of the tablet OUTPUT_SCHEMA are kept as ParsedListing records, other
+    schemas keep the model's values as they are.
+    Parsed items are matched against the saved alert queries in queries_path.
+    Returns parsed data as a list of dicts, in input order.
     """
+    from langchain.output_parsers import StructuredOutputParser
+    from langchain_community.llms import Ollama
 
-    llm = Ollama(model=MODEL_NAME)
+    llm = Ollama(model=MODEL_NAME, keep_alive=KEEP_ALIVE)
     output_parser = StructuredOutputParser.from_response_schemas(output_schema)
     format_instructions = output_parser.get_format_instructions()
+    prompt = build_prompt(format_instructions, dynamic_instructions, prompt_layout, bulk=True)
+    typed = is_parsed_listing_schema(output_schema)
 
-    prompt = PromptTemplate(
-        template="""
-        You are a strict data parsing assistant.
-        Input (list of records): {input_data}
+    alerts = StandingQueryEngine.load(queries_path) if queries_path else StandingQueryEngine()
+    sink = default_sink() if alerts.queries else None
 
-        {dynamic_instructions}
+    with open(input_json_path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)  # a list of dicts
 
-        Only return JSON (list of objects) that matches the following rules and fields:
-        {format_instructions}
-        Do not return any other text or explanations.
-        """,
-        input_variables=["input_data", "dynamic_instructions"],
-        partial_variables={"format_instructions": format_instructions}
+    partial_path = output_json_path + ".partial.jsonl"
+    parsed, failed_rows = parse_rows(
+        llm, prompt, data, partial_path, input_fingerprint(raw), typed,
+        on_record=(lambda listing: alerts.process([listing], sink)) if sink is not None else None,
+        batch_size=batch_size, max_attempts=max_attempts,
     )
 
-    with open(input_json_path, encoding="utf-8") as f:
-        data = json.load(f)  # a list of dicts
-
-    llm_input = prompt.format(input_data=json.dumps(data, ensure_ascii=False), dynamic_instructions=dynamic_instructions)
-    print("Prompt for LLM:\n", llm_input)
-
-    raw_output = llm(llm_input)
-    try:
-        parsed_output = output_parser.parse(raw_output)
-    except Exception as e:
-        print(f"Parsing failed for bulk data.")
-        print("Raw output was:\n", raw_output)
-        parsed_output = []
-
     # Save to output file
-    with open(output_json_path, "w", encoding="utf-8") as out_f:
-        json.dump(parsed_output, out_f, ensure_ascii=False, indent=2)
-    print(f"Finished. Parsed {len(parsed_output)} rows, saved to {output_json_path}")
\ No newline at end of file
+    results = [listing for listing in parsed if listing is not None]
+    write_listings_json(output_json_path, results)
+    if not failed_rows:
+        os.remove(partial_path)
+    else:
+        print(f"Gave up on {len(failed_rows)} rows after {max_attempts} attempts, "
+              f"progress kept in {partial_path}.")
+    print(f"Finished. Parsed {len(results)} rows, saved to {output_json_path}")
+    return [listing.to_dict() if typed else listing for listing in results]
@@ -0,0 +1,55 @@
+import json
+import argparse
+
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.page_cache import open_cache
+from core.params import json_params_fn
+from core.scanner import ScanJob, run_scans
+from core.sources import available_sources
+from tool_registry import lazy_tool_attrs
+
+def scan_sources(query, sources="olx", item_count=10, output_path="scan_results.json", cache_dir=None, offline=False):
+    """
+    Scans several sources for the same query concurrently on one fetch engine.
+    sources may be a list or a comma separated string of source names.
+    Saves all records to a JSON file (each with a "Source" key) and returns them.
+    cache_dir / offline enable the on-disk page cache and offline replay from it.
+    """
+    if isinstance(sources, str):
+        sources = [name.strip() for name in sources.split(",") if name.strip()]
+    jobs = [ScanJob(name, query, int(item_count)) for name in sources]
+    out = []
+    for job, records in zip(jobs, run_scans(jobs, cache=open_cache(cache_dir, offline))):
+        for record in records:
+            record = record.to_dict() if hasattr(record, "to_dict") else dict(record)
+            out.append({"Source": job.source, **record})
+    if not out:
+        raise ValueError("No data to write.")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+    return out
+
+# Accepts a JSON object/dict with the scan_sources parameters
+scan_sources_json = json_params_fn(scan_sources)
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-source scraper CLI")
+    parser.add_argument("--query", type=str, required=True, help="Phrase to search for (e.g. 'tablet')")
+    parser.add_argument("--sources", type=str, default="olx", help=f"Comma separated sources ({', '.join(available_sources())})")
+    parser.add_argument("--item_count", type=int, default=10, help="Max number of items per source")
+    parser.add_argument("--output_path", type=str, default="scan_results.json", help="Output JSON file name")
+    parser.add_argument("--cache_dir", type=str, default=None, help="Keep fetched pages in this page cache directory")
+    parser.add_argument("--offline", type=str, choices=["true", "false"], default="false", help="Replay from the page cache without network")
+    args = parser.parse_args()
+
+    results = scan_sources(args.query, args.sources, args.item_count, args.output_path,
+                           args.cache_dir, args.offline.lower() == "true")
+    print(f"✅ Done! {len(results)} listings saved to '{args.output_path}'.")
+
+# LangChain Tool is built on first access
+__getattr__ = lazy_tool_attrs(__name__, {"scan_sources_tool": "scan_sources_json"})
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from scraping_scripts.olx_scrape_fn import olx_scrape_fn
+from core.olx_scraper import olx_scrape
 
 SEARCH_PHRASE = "tablet"
 ITEM_COUNT = 20
@@ -6,13 +6,15 @@ LOCALISATION = True
 MAXIMIZE_WINDOW = True
 
 SCRAPED_FILE_PATH = "data/scraped/tablets.json"
+HISTORY_PATH = "data/history"
 
-# olx_scrape_fn(
+# olx_scrape(
 #     search_phrase=SEARCH_PHRASE,
 #     item_count=ITEM_COUNT,
 #     localisation=LOCALISATION,
 #     maximize_window=MAXIMIZE_WINDOW,
-#     output_path=SCRAPED_FILE_PATH
+#     output_path=SCRAPED_FILE_PATH,
+#     history_path=HISTORY_PATH
 # )
 # print(f"\n## PIPELINE ## Scraped {ITEM_COUNT} items for '{SEARCH_PHRASE}' and saved to {SCRAPED_FILE_PATH}\n")
 
@@ -20,20 +22,8 @@ SCRAPED_FILE_PATH = "data/scraped/tablets.json"
 ####################################################################
 
 from parsing_agent import parse_json_file
+from tablets_schema import DYNAMIC_INSTRUCTIONS, OUTPUT_SCHEMA
 PROCESSED_FILE_PATH = "data/processed/tablets_parsed.json"
-OUTPUT_SCHEMA = [
-        {"name": "manufacturer", "description": "Manufacturer of the tablet", "type": "string"},
-        {"name": "model", "description": "Model of the tablet, leave as 'tablet' if not available", "type": "string"},
-        {"name": "ram_size", "description": "RAM size in GB, watch out for storage size confusion", "type": "float"},
-        {"name": "storage_size", "description": "Storage size in GB", "type": "float"},
-        {"name": "release_date", "description": "Release date of the tablet", "type": "string"},
-        {"name": "screen_size", "description": "Screen size in inches", "type": "float"},
-        {"name": "price", "description": "Price of the tablet in PLN", "type": "integer"},
-        {"name": "device_condition", "description": "Condition of the device, try to be precise (used briefly, used a lot etc.) if possible", "type": "string"},
-        {"name": "listing_time", "description": "When the listing was created or published", "type": "string"},
-        {"name": "url", "description": "URL of the listing", "type": "string"}
-    ]
-DYNAMIC_INSTRUCTIONS = "If a field is not available leave unknown for string and 0 for numbers."
 
 parse_json_file(
     input_json_path=SCRAPED_FILE_PATH,
@@ -46,11 +36,11 @@ print(f"\n## PIPELINE ## Parsed {ITEM_COUNT} items and saved to {PROCESSED_FILE_
 ####################################################################
 ####################################################################
 
-from utils.json_to_csv import json_to_csv
+from core.listing import ParsedListing, read_listings_json, write_listings_csv
 CSV_FILE_PATH = "data/processed/tablets_parsed.csv"
 
-json_to_csv(
-    input_file=PROCESSED_FILE_PATH,
-    output_file=CSV_FILE_PATH
+write_listings_csv(
+    CSV_FILE_PATH,
+    read_listings_json(PROCESSED_FILE_PATH, ParsedListing)
 )
 print(f"## PIPELINE ## Converted JSON to CSV and saved to {CSV_FILE_PATH}")
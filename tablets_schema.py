@@ -0,0 +1,14 @@
+# Fields the parsing agent extracts from each tablet listing
+OUTPUT_SCHEMA = [
+    {"name": "manufacturer", "description": "Manufacturer of the tablet", "type": "string"},
+    {"name": "model", "description": "Model of the tablet, leave as 'tablet' if not available", "type": "string"},
+    {"name": "ram_size", "description": "RAM size in GB, watch out for storage size confusion", "type": "float"},
+    {"name": "storage_size", "description": "Storage size in GB", "type": "float"},
+    {"name": "release_date", "description": "Release date of the tablet", "type": "string"},
+    {"name": "screen_size", "description": "Screen size in inches", "type": "float"},
+    {"name": "price", "description": "Price of the tablet in PLN", "type": "integer"},
+    {"name": "device_condition", "description": "Condition of the device, try to be precise (used briefly, used a lot etc.) if possible", "type": "string"},
+    {"name": "listing_time", "description": "When the listing was created or published", "type": "string"},
+    {"name": "url", "description": "URL of the listing", "type": "string"}
+]
+DYNAMIC_INSTRUCTIONS = "If a field is not available leave unknown for string and 0 for numbers."
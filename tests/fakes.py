@@ -0,0 +1,44 @@
+import os
+import sys
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.fetch import FetchEngine, FetchResult
+
+
+class StubEngine(FetchEngine):
+    """
+    FetchEngine answering from canned responses instead of aiohttp.
+
+    pages maps a URL to a FetchResult, an exception, a callable
+    (url, headers) -> FetchResult, or a list of those used one per request
+    (the last one repeats). Unknown URLs return 404. delay is the time each
+    request takes, either one value or per URL.
+    """
+
+    def __init__(self, pages=None, delay=0.0, **options):
+        options.setdefault("min_interval", 0.0)
+        options.setdefault("jitter", 0.0)
+        super().__init__(**options)
+        self.pages = pages if pages is not None else {}
+        self.delay = delay
+        self.requests = []
+
+    def _open_session(self):
+        return None
+
+    async def _request(self, url, headers=None):
+        self.requests.append((url, dict(headers or {})))
+        delay = self.delay.get(url, 0.0) if isinstance(self.delay, dict) else self.delay
+        if delay:
+            await asyncio.sleep(delay)
+        response = self.pages.get(url)
+        if isinstance(response, list):
+            response = response.pop(0) if len(response) > 1 else response[0]
+        if callable(response):
+            response = response(url, headers)
+        if response is None:
+            response = FetchResult(url, 404, "")
+        if isinstance(response, BaseException):
+            raise response
+        return response
@@ -0,0 +1,91 @@
+import os
+import sys
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.alerts import JsonlSink, StandingQuery, StandingQueryEngine, _parse_where
+from core.listing import ParsedListing
+
+MANUFACTURERS = ["Apple", "Samsung", "Lenovo", "Xiaomi", "unknown"]
+MODELS = ["iPad Air", "Galaxy Tab S9", "Tab M10", "Pad 6", "tablet"]
+CONDITIONS = ["new", "as new", "used briefly", "used a lot"]
+
+
+def _random_listing(rng, i):
+    return ParsedListing.from_dict({
+        "manufacturer": rng.choice(MANUFACTURERS),
+        "model": rng.choice(MODELS),
+        "ram_size": rng.choice([0, 2, 3, 4, 6, 8, 12, None]),
+        "storage_size": rng.choice([32, 64, 128, 256, 512, None]),
+        "screen_size": rng.choice([8.7, 10.1, 11, 12.9, None]),
+        "price": rng.choice([None, rng.randint(0, 5000)]),
+        "device_condition": rng.choice(CONDITIONS),
+        "url": f"https://www.olx.pl/d/oferta/x-ID{i}.html",
+    })
+
+
+def _random_query(rng, i):
+    where = {}
+    if rng.random() < 0.6:
+        lo = rng.choice([None, rng.randint(0, 3000)])
+        hi = rng.choice([None, rng.randint(3000, 6000)])
+        where["price"] = {k: v for k, v in (("min", lo), ("max", hi)) if v is not None} or {"min": 0}
+    if rng.random() < 0.4:
+        where["ram_size"] = rng.choice([{"min": rng.choice([2, 4, 8])}, 8, [4, 8.0]])
+    if rng.random() < 0.4:
+        where["manufacturer"] = rng.sample(MANUFACTURERS, rng.randint(1, 2))
+    if rng.random() < 0.3:
+        where["device_condition"] = rng.choice(CONDITIONS).upper()
+    if rng.random() < 0.3:
+        where["model"] = {"contains": rng.choice(["tab", "ipad", "pad"])}
+    return StandingQuery(f"q{i}", where)
+
+
+def test_indexed_match_equals_brute_force():
+    rng = random.Random(7)
+    queries = [_random_query(rng, i) for i in range(300)]
+    engine = StandingQueryEngine(queries)
+    listings = [_random_listing(rng, i) for i in range(500)]
+    matched = 0
+    for listing in listings:
+        expected = sorted(q.id for q in queries if q.check(listing))
+        assert sorted(q.id for q in engine.match(listing)) == expected
+        # Plain dicts (custom schemas) go through the same code paths
+        assert sorted(q.id for q in engine.match(listing.to_dict())) == expected
+        matched += len(expected)
+    assert matched > 0
+
+
+def test_cli_numeric_equality_matches_float_fields():
+    where = _parse_where(["ram_size=8", "price=1500", "storage_size=64,128", "manufacturer=Samsung"])
+    assert where == {"ram_size": 8.0, "price": 1500.0, "storage_size": [64.0, 128.0], "manufacturer": "Samsung"}
+    engine = StandingQueryEngine([StandingQuery("q", where)])
+    listing = ParsedListing.from_dict({"manufacturer": "samsung", "ram_size": "8", "storage_size": 128, "price": "1 500"})
+    assert [q.id for q in engine.match(listing)] == ["q"]
+
+
+def test_jsonl_sink_without_urls(tmp_path):
+    path = str(tmp_path / "alerts.jsonl")
+    query = StandingQuery("cheap", {"price": {"max": 1000}})
+    a = ParsedListing.from_dict({"model": "Tab A", "price": 500, "url": "unknown"})
+    b = ParsedListing.from_dict({"model": "Tab B", "price": 600, "url": "unknown"})
+    c = ParsedListing.from_dict({"model": "Tab C", "price": 700})
+    d = ParsedListing.from_dict({"model": "Tab D", "price": 800, "url": "https://www.olx.pl/d/oferta/x-ID1.html"})
+
+    sink = JsonlSink(path)
+    assert [sink.notify(query, l) for l in (a, b, c, d, a, d)] == [True, True, True, True, False, False]
+    # Seen alerts survive a restart
+    assert not any(JsonlSink(path).notify(query, l) for l in (a, b, c, d))
+
+
+def test_unknown_numbers_do_not_match_upper_bounds():
+    # DYNAMIC_INSTRUCTIONS asks the model for 0 when a number is unknown
+    engine = StandingQueryEngine([
+        StandingQuery("low-ram", _parse_where(["ram_size<=4"])),
+        StandingQuery("cheap", _parse_where(["price<=500"])),
+    ])
+    unknown = ParsedListing.from_dict({"model": "tablet", "ram_size": 0, "price": "0", "screen_size": "0.0"})
+    assert (unknown.ram_size, unknown.price, unknown.screen_size) == (None, None, None)
+    assert engine.match(unknown) == []
+    known = ParsedListing.from_dict({"model": "Tab A", "ram_size": 3, "price": 450})
+    assert sorted(q.id for q in engine.match(known)) == ["cheap", "low-ram"]
@@ -0,0 +1,95 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import core.history as history
+from core.history import HistoryStore
+from core.listing import RawListing
+
+
+def _listing(ad_id, price, title="Tablet"):
+    return RawListing(
+        title=title, price=price, price_text="" if price is None else f"{price} zł", negotiable=False,
+        location="Gdańsk", listing_time="Dzisiaj", url=f"https://www.olx.pl/d/oferta/x-ID{ad_id}.html", ad_id=ad_id,
+    )
+
+
+# (scan time, {ad_id: price}) - "b" goes to "Za darmo" and back, "c" starts without a price
+SCANS = [
+    (1000, {"a": 1000.0, "b": 1000.0, "c": None}),
+    (2000, {"a": 950.0, "b": None, "c": None}),
+    (3000, {"a": 950.0, "b": 800.0, "c": 120.5}),
+    (4000, {"a": 900.0, "b": 700.0, "c": None}),
+]
+
+
+def _record(store, scans):
+    for ts, prices in scans:
+        store.record_scan([_listing(ad_id, price) for ad_id, price in prices.items()], scanned_at=ts)
+
+
+def _snapshot(store):
+    return {ad_id: store.price_history(ad_id) for ad_id in sorted(store.ad_ids())}, store.scan_times
+
+
+def test_reopen_keeps_price_history(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    _record(store, SCANS)
+    expected = _snapshot(store)
+    assert expected[0]["b"] == [(1000, 1000.0), (2000, None), (3000, 800.0), (4000, 700.0)]
+    assert _snapshot(HistoryStore(str(tmp_path))) == expected
+
+
+def test_compact_round_trip(tmp_path):
+    store = HistoryStore(str(tmp_path), segment_max_bytes=1)
+    _record(store, SCANS)
+    expected = _snapshot(store)
+    assert len(store._segment_paths()) == len(SCANS)
+
+    store.compact()
+    assert len(store._segment_paths()) == 1
+    assert _snapshot(store) == expected
+    reopened = HistoryStore(str(tmp_path))
+    assert _snapshot(reopened) == expected
+    assert reopened.latest("b").title == "Tablet"
+
+    # Later scans are diffed against the compacted prices
+    reopened.record_scan([_listing("b", 650.0)], scanned_at=5000)
+    assert reopened.price_drops() == [("b", 700.0, 650.0)]
+    assert HistoryStore(str(tmp_path)).price_history("b")[-1] == (5000, 650.0)
+
+
+def test_crash_during_compaction(tmp_path, monkeypatch):
+    store = HistoryStore(str(tmp_path), segment_max_bytes=1)
+    _record(store, SCANS)
+    expected = _snapshot(store)
+
+    def crash(path):
+        raise OSError("crash before old segments were removed")
+
+    monkeypatch.setattr(history.os, "remove", crash)
+    try:
+        store.compact()
+    except OSError:
+        pass
+    monkeypatch.undo()
+
+    assert len(store._segment_paths()) == len(SCANS)
+    assert _snapshot(HistoryStore(str(tmp_path))) == expected
+
+
+def test_truncated_tail_is_dropped(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    _record(store, SCANS)
+    path = store._segment_paths()[-1]
+    size = os.path.getsize(path)
+    store.record_scan([_listing("a", 1.0)], scanned_at=5000)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 2)
+
+    reopened = HistoryStore(str(tmp_path))
+    assert os.path.getsize(path) == size
+    assert _snapshot(reopened)[0]["a"] == [(1000, 1000.0), (2000, 950.0), (4000, 900.0)]
+    # Appending after the cut continues the same segment
+    reopened.record_scan([_listing("a", 1.0)], scanned_at=6000)
+    assert HistoryStore(str(tmp_path)).price_history("a")[-1] == (6000, 1.0)
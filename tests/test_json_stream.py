@@ -0,0 +1,61 @@
+import os
+import sys
+import json
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.json_stream import JsonArrayStreamParser
+
+RECORDS = [
+    {"model": "Tab S9", "price": 2500, "url": "https://www.olx.pl/d/oferta/a-ID1.html"},
+    {"model": 'iPad "Air" {5}', "note": "brace } and bracket ] in a string, escaped \\\" quote", "tags": [1, {"x": []}]},
+    {"model": "Pad 6", "price": None, "extra": {"nested": {"deep": [1, 2, 3]}}},
+]
+
+
+def _feed_in_chunks(text, rng):
+    parser = JsonArrayStreamParser()
+    out = []
+    pos = 0
+    while pos < len(text):
+        step = rng.randint(1, 12)
+        out.extend(parser.feed(text[pos:pos + step]))
+        pos += step
+    return parser, out
+
+
+def test_arbitrary_chunk_splits():
+    text = json.dumps(RECORDS, ensure_ascii=False, indent=2)
+    rng = random.Random(3)
+    for _ in range(200):
+        parser, out = _feed_in_chunks(text, rng)
+        assert out == RECORDS and parser.errors == 0 and parser.pending == ""
+
+
+def test_records_arrive_as_soon_as_they_close():
+    parser = JsonArrayStreamParser()
+    first = json.dumps(RECORDS[0])
+    assert parser.feed("[" + first[:-1]) == []
+    assert parser.feed("}, " + json.dumps(RECORDS[1])[:5]) == [RECORDS[0]]
+
+
+def test_think_blocks_and_code_fences():
+    body = json.dumps(RECORDS, ensure_ascii=False)
+    text = "<think>The user wants [a list] of {objects}...</think>\n```json\n" + body + "\n```\nDone."
+    rng = random.Random(5)
+    for _ in range(100):
+        parser, out = _feed_in_chunks(text, rng)
+        assert out == RECORDS and parser.errors == 0
+
+
+def test_bare_objects_without_array():
+    text = "\n".join(json.dumps(r) for r in RECORDS)
+    assert JsonArrayStreamParser().feed(text) == RECORDS
+
+
+def test_truncated_tail_and_malformed_record():
+    text = "[" + json.dumps(RECORDS[0]) + ', {"model": bad}, ' + json.dumps(RECORDS[1]) + ', {"model": "Pad'
+    parser = JsonArrayStreamParser()
+    assert parser.feed(text) == [RECORDS[0], RECORDS[1]]
+    assert parser.errors == 1
+    assert parser.pending == '{"model": "Pad'
@@ -0,0 +1,73 @@
+import os
+import csv
+import sys
+import json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.csv_io import json_to_csv
+from core.listing import (
+    ParsedListing, RawListing, is_parsed_listing_schema, read_listings_jsonl, write_listings_json, write_listings_jsonl
+)
+from tablets_schema import OUTPUT_SCHEMA
+
+RAW = [
+    {"Title": 'iPad "Pro" 12,9', "Price": "2 200 zł\ndo negocjacji", "Location/Date": "Gdańsk, Osowa - Dzisiaj o 17:01",
+     "URL": "https://www.olx.pl/d/oferta/ipad-CID99-ID15NSnF.html", "Description": "Stan idealny \\ bez rys\t😀"},
+    {"Title": "Tablet", "Price": "Za darmo", "Location/Date": "Sopot", "URL": "", "Description": ""},
+]
+PARSED = [
+    {"manufacturer": "Apple", "model": "iPad", "ram_size": "8GB", "storage_size": 256, "screen_size": "12,9",
+     "price": "4 399 zł", "device_condition": "as new", "url": "https://www.olx.pl/d/oferta/x-ID1.html"},
+    {"manufacturer": "unknown", "ram_size": 0, "price": 0, "colour": "szary", "tags": ["a", None, 1.5]},
+]
+
+
+def test_jsonl_lines_match_json_dumps(tmp_path):
+    path = str(tmp_path / "out.jsonl")
+    for cls, records in ((RawListing, RAW), (ParsedListing, PARSED)):
+        listings = [cls.from_dict(rec) for rec in records]
+        write_listings_jsonl(path, listings)
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert lines == [json.dumps(l.to_dict(), ensure_ascii=False) for l in listings]
+        assert read_listings_jsonl(path, cls) == listings
+
+
+def test_parsed_listing_coerces_numbers():
+    listing = ParsedListing.from_dict(PARSED[0])
+    assert (listing.ram_size, listing.screen_size, listing.price) == (8.0, 12.9, 4399)
+    assert ParsedListing.from_dict(PARSED[1]).extra == {"colour": "szary", "tags": ["a", None, 1.5]}
+
+
+def test_only_tablet_schema_is_typed(tmp_path):
+    assert is_parsed_listing_schema(OUTPUT_SCHEMA)
+    assert not is_parsed_listing_schema([{"name": "event"}, {"name": "price"}])
+    assert not is_parsed_listing_schema("not a schema")
+
+    # Custom schema output is written as-is
+    path = str(tmp_path / "out.json")
+    write_listings_json(path, [{"event": "Koncert", "price": "free"}])
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == [{"event": "Koncert", "price": "free"}]
+
+
+def test_json_to_csv_uses_typed_writer_for_listing_files(tmp_path):
+    def convert(records):
+        src, out = str(tmp_path / "in.json"), str(tmp_path / "out.csv")
+        with open(src, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
+        n = json_to_csv(src, out)
+        with open(out, newline="", encoding="utf-8") as f:
+            return n, list(csv.reader(f))
+
+    n, rows = convert(RAW)
+    assert n == 2 and rows[0] == list(RawListing.CSV_HEADER) and rows[1][1] == RAW[0]["Price"]
+
+    parsed = [{name: PARSED[0].get(name, "") for name in ParsedListing.CSV_HEADER}]
+    n, rows = convert(parsed)
+    assert rows[0] == list(ParsedListing.CSV_HEADER)
+    assert rows[1][ParsedListing.CSV_HEADER.index("ram_size")] == "8.0"
+
+    # Anything else is flattened as before (sorted dotted keys, values untouched)
+    n, rows = convert([{"event": {"name": "Koncert"}, "price": "free"}])
+    assert rows == [["event.name", "price"], ["Koncert", "free"]]
@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from fakes import StubEngine
+import core.olx_scraper as olx_scraper
+import core.page_cache as page_cache
+from core.fetch import FetchResult
+from core.listing import RawListing
+from core.page_cache import PageCache
+
+URL_A = "http://olx/a"
+URL_B = "http://olx/b"
+
+
+def _body(url):
+    # Random-looking text, so gzip cannot shrink it below the eviction limits
+    return "".join(f"{url}-{i * 7919 % 10007};" for i in range(60))
+
+
+def _server(etag='"v1"'):
+    """
+    Answers 304 to a matching If-None-Match, else 200 with an ETag.
+    """
+    def answer(url, headers):
+        if headers and headers.get("If-None-Match") == etag:
+            return FetchResult(url, 304, "", {"ETag": etag})
+        return FetchResult(url, 200, _body(url), {"ETag": etag, "Content-Type": "text/html"})
+
+    return answer
+
+
+def _fetch(cache, urls, pages=None):
+    engine = StubEngine(pages if pages is not None else {URL_A: _server(), URL_B: _server()}, cache=cache)
+
+    async def run():
+        async with engine:
+            return [await engine.fetch(url) for url in urls]
+
+    return asyncio.run(run()), engine.requests
+
+
+def _cache_size(path):
+    return PageCache(str(path)).total_bytes
+
+
+def test_fresh_hit_is_served_from_disk(tmp_path):
+    cache = PageCache(str(tmp_path), ttl=3600)
+    (first, second), requests = _fetch(cache, [URL_A, URL_A])
+    assert first.text == second.text == _body(URL_A) and second.ok
+    assert len(requests) == 1 and (cache.hits, cache.misses) == (1, 1)
+
+    # Served from disk after reopening too
+    cache = PageCache(str(tmp_path), ttl=3600)
+    (page,), requests = _fetch(cache, [URL_A])
+    assert page.text == _body(URL_A) and requests == []
+
+
+def test_stale_page_is_revalidated(tmp_path):
+    _fetch(PageCache(str(tmp_path)), [URL_A])
+    cache = PageCache(str(tmp_path), ttl=0)
+    (page,), requests = _fetch(cache, [URL_A])
+    assert requests[0][1]["If-None-Match"] == '"v1"'
+    assert page.status == 200 and page.text == _body(URL_A) and cache.revalidated == 1
+
+    # A changed page replaces the cached body
+    cache = PageCache(str(tmp_path), ttl=0)
+    (page,), _ = _fetch(cache, [URL_A], {URL_A: lambda url, h: FetchResult(url, 200, "new", {"ETag": '"v2"'})})
+    assert page.text == "new" and cache.get(URL_A).headers["ETag"] == '"v2"'
+    assert cache.load(cache.get(URL_A)).text == "new"
+
+
+def test_eviction_keeps_cache_under_max_bytes(tmp_path):
+    cache = PageCache(str(tmp_path), max_bytes=10 ** 9)
+    _fetch(cache, [URL_A])
+    page_size = cache.total_bytes
+
+    cache = PageCache(str(tmp_path), max_bytes=int(page_size * 1.5))
+    urls = [f"http://olx/{i}" for i in range(5)]
+    _fetch(cache, urls, {url: _server() for url in urls})
+    assert cache.total_bytes <= cache.max_bytes and len(cache) == 1
+    # The least recently used pages went first
+    assert cache.get(urls[-1]) is not None
+    assert len([n for n in os.listdir(tmp_path) if n.endswith(".html.gz")]) == 1
+
+
+def test_eviction_during_revalidation_refetches(tmp_path):
+    _fetch(PageCache(str(tmp_path)), [URL_A])
+    cache = PageCache(str(tmp_path), ttl=0, max_bytes=_cache_size(tmp_path) + 10)
+    engine = StubEngine({URL_A: _server(), URL_B: _server()}, delay={URL_A: 0.1}, cache=cache)
+
+    async def run():
+        async with engine:
+            revalidating = asyncio.ensure_future(engine.fetch(URL_A))
+            await asyncio.sleep(0.01)
+            # Stores B and evicts A while A's conditional request is in flight
+            await engine.fetch(URL_B)
+            return await revalidating
+
+    page = asyncio.run(run())
+    assert page.ok and page.text == _body(URL_A)
+    # A was asked for again without validators after its entry disappeared
+    assert [(url, "If-None-Match" in headers) for url, headers in engine.requests] == [
+        (URL_A, True), (URL_B, False), (URL_A, False)
+    ]
+
+
+def test_offline_serves_cache_only(tmp_path):
+    _fetch(PageCache(str(tmp_path), ttl=0), [URL_A])
+    cache = PageCache(str(tmp_path), ttl=0, offline=True)
+    (hit, miss), requests = _fetch(cache, [URL_A, URL_B])
+    assert hit.text == _body(URL_A) and miss.status == 504
+    assert requests == [] and (cache.hits, cache.misses) == (1, 1)
+
+
+def test_reopen_after_crash_drops_orphans(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_cache, "SAVE_EVERY", 2)
+    cache = PageCache(str(tmp_path))
+    for i in range(3):
+        cache.put(f"http://olx/{i}", FetchResult(f"http://olx/{i}", 200, _body(str(i))))
+    # Crash: the third page was never written to the index, the first lost its body
+    with open(tmp_path / "index.json", encoding="utf-8") as f:
+        assert len(json.load(f)) == 2
+    os.remove(os.path.join(tmp_path, cache.get("http://olx/0").key + ".html.gz"))
+
+    reopened = PageCache(str(tmp_path))
+    assert len(reopened) == 1 and reopened.get("http://olx/1") is not None
+    assert reopened.total_bytes == reopened.get("http://olx/1").size
+    assert [n for n in os.listdir(tmp_path) if n.endswith(".gz")] == [reopened.get("http://olx/1").key + ".html.gz"]
+
+
+####################################################################
+# olx_scrape and the price history
+####################################################################
+
+def _scrape_with_cache_spy(monkeypatch, tmp_path, **options):
+    caches = []
+
+    def fake_run_scans(jobs, cache=None):
+        caches.append(cache)
+        return [[RawListing.from_fields("Tablet", "1 000 zł", "Gdańsk - Dzisiaj", "https://www.olx.pl/d/oferta/t-ID1.html")]]
+
+    monkeypatch.setattr(olx_scraper, "run_scans", fake_run_scans)
+    olx_scraper.olx_scrape("tablet", output_path=str(tmp_path / "out.json"),
+                           history_path=str(tmp_path / "history"), cache_dir=str(tmp_path / "cache"), **options)
+    return caches[0]
+
+
+def test_offline_replay_is_not_recorded_in_history(tmp_path, monkeypatch):
+    cache = _scrape_with_cache_spy(monkeypatch, tmp_path, offline=True)
+    assert cache.offline
+    assert not os.path.exists(tmp_path / "history")
+
+
+def test_history_scans_revalidate_cached_pages(tmp_path, monkeypatch):
+    cache = _scrape_with_cache_spy(monkeypatch, tmp_path)
+    assert cache.ttl == 0 and not cache.offline
+    assert os.listdir(tmp_path / "history")
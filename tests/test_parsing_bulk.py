@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from parsing_agent_bulk import input_fingerprint, parse_rows
+
+ROWS = [{"Title": f"Tablet {i}", "URL": f"https://www.olx.pl/d/oferta/x-ID{i}.html"} for i in range(4)]
+RAW = json.dumps(ROWS).encode("utf-8")
+
+
+class FakePrompt:
+    def format(self, input_data):
+        return input_data
+
+
+class ScriptedLLM:
+    """
+    Streams one scripted answer per call; each answer is a function of the
+    rows that were sent and returns text chunks (or raises mid-stream).
+    """
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.sent = []
+
+    def stream(self, llm_input):
+        rows = json.loads(llm_input)
+        self.sent.append([row["URL"] for row in rows])
+        yield from self.answers.pop(0)(rows)
+
+
+def rec(i, **fields):
+    return json.dumps({"model": f"Tab {i}", "price": 100 + i, "url": ROWS[i]["URL"], **fields})
+
+
+def array(*records):
+    # Split every record in two chunks, like a token stream
+    chunks = ["["]
+    for n, record in enumerate(records):
+        half = len(record) // 2
+        chunks += [("," if n else "") + record[:half], record[half:]]
+    return chunks + ["]"]
+
+
+def run(tmp_path, llm, rows=ROWS, raw=RAW, **options):
+    seen = []
+    parsed, failed = parse_rows(
+        llm, FakePrompt(), rows, str(tmp_path / "out.json.partial.jsonl"), input_fingerprint(raw),
+        on_record=seen.append, **options,
+    )
+    return [p and p.model for p in parsed], failed, [l.model for l in seen]
+
+
+def test_all_rows_in_one_generation(tmp_path):
+    llm = ScriptedLLM(lambda rows: array(*(rec(i) for i in range(4))))
+    assert run(tmp_path, llm) == (["Tab 0", "Tab 1", "Tab 2", "Tab 3"], [], ["Tab 0", "Tab 1", "Tab 2", "Tab 3"])
+
+
+def test_changed_url_falls_back_to_position(tmp_path):
+    llm = ScriptedLLM(lambda rows: array(rec(0), rec(1, url="unknown"), rec(2, url=None), rec(3)))
+    models, failed, alerted = run(tmp_path, llm)
+    assert models == ["Tab 0", "Tab 1", "Tab 2", "Tab 3"] and failed == [] and len(llm.sent) == 1
+
+
+def test_duplicate_record_is_dropped_and_row_resent(tmp_path):
+    llm = ScriptedLLM(
+        lambda rows: array(rec(0), rec(0, model="Again"), rec(2), rec(3)),
+        lambda rows: array(rec(1)),
+    )
+    models, failed, alerted = run(tmp_path, llm)
+    assert models == ["Tab 0", "Tab 1", "Tab 2", "Tab 3"] and failed == []
+    assert llm.sent[1] == [ROWS[1]["URL"]]
+    # Alerts fire once per row
+    assert alerted == ["Tab 0", "Tab 2", "Tab 3", "Tab 1"]
+
+
+def test_truncated_generation_resends_missing_rows(tmp_path):
+    llm = ScriptedLLM(
+        lambda rows: array(rec(0), rec(1))[:-1] + [", " + rec(2)[:10]],
+        lambda rows: array(rec(3), rec(2)),
+    )
+    models, failed, _ = run(tmp_path, llm)
+    assert models == ["Tab 0", "Tab 1", "Tab 2", "Tab 3"]
+    assert llm.sent[1] == [ROWS[2]["URL"], ROWS[3]["URL"]]
+
+
+def test_gives_up_after_max_attempts(tmp_path):
+    # The model keeps answering with row 0, which is not part of later requests
+    llm = ScriptedLLM(*[lambda rows: array(rec(0))] * 4)
+    models, failed, alerted = run(tmp_path, llm, max_attempts=2, batch_size=2)
+    assert models == ["Tab 0", None, None, None] and failed == [1, 2, 3] and alerted == ["Tab 0"]
+    assert llm.sent == [[ROWS[0]["URL"], ROWS[1]["URL"]], [ROWS[1]["URL"]],
+                        [ROWS[2]["URL"], ROWS[3]["URL"]], [ROWS[2]["URL"], ROWS[3]["URL"]]]
+
+
+def _crash_after(*records):
+    def answer(rows):
+        yield from array(*records)[:-1]
+        raise KeyboardInterrupt
+
+    return answer
+
+
+def test_resume_after_crash(tmp_path):
+    with pytest.raises(KeyboardInterrupt):
+        run(tmp_path, ScriptedLLM(_crash_after(rec(0), rec(1))))
+
+    # A crash can leave a cut-off last line in the sidecar
+    partial = tmp_path / "out.json.partial.jsonl"
+    with open(partial, "a", encoding="utf-8") as f:
+        f.write('{"row": 2, "record": {"mod')
+
+    with pytest.raises(KeyboardInterrupt):
+        run(tmp_path, ScriptedLLM(_crash_after(rec(2))))
+
+    llm = ScriptedLLM(lambda rows: array(rec(3)))
+    models, failed, alerted = run(tmp_path, llm)
+    assert models == ["Tab 0", "Tab 1", "Tab 2", "Tab 3"] and failed == []
+    assert llm.sent == [[ROWS[3]["URL"]]] and alerted == ["Tab 3"]
+
+
+def test_sidecar_of_other_input_is_not_reused(tmp_path):
+    with pytest.raises(KeyboardInterrupt):
+        run(tmp_path, ScriptedLLM(_crash_after(rec(0), rec(1))))
+
+    # Same path and row count, new scrape
+    new_rows = [{**row, "Title": row["Title"] + " (new)"} for row in ROWS]
+    llm = ScriptedLLM(lambda rows: array(*(rec(i) for i in range(4))))
+    models, failed, _ = run(tmp_path, llm, rows=new_rows, raw=json.dumps(new_rows).encode("utf-8"))
+    assert len(llm.sent[0]) == 4 and failed == []
@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import time
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from fakes import StubEngine
+from core.fetch import FetchResult
+from core.scanner import ScanJob, scan_source, scan_sources
+from core.sources import register_source
+from core.sources.base import Source
+
+
+def _page(url, items):
+    return FetchResult(url, 200, json.dumps(items))
+
+
+def _source(name, **options):
+    # Result and detail pages are JSON, so no HTML parser is needed
+    options = {"max_pages": 5, "min_interval": 0.0, "jitter": 0.0, **options}
+    return Source(
+        name=name, search_url=f"http://{name}/{{query}}?page={{page}}",
+        parse_results=lambda text, url: json.loads(text), detail_url_field="url",
+        parse_detail=lambda text, url: json.loads(text), **options,
+    )
+
+
+def _items(name, start, count):
+    return [{"title": f"{name}-{i}", "url": f"http://{name}/ad/{i}"} for i in range(start, start + count)]
+
+
+def _detail_pages(name, count):
+    return {f"http://{name}/ad/{i}": _page(f"http://{name}/ad/{i}", {"price": str(i)}) for i in range(count)}
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _scan(engine, job):
+    async with engine:
+        return await scan_source(engine, job)
+
+
+async def _scan_fetch(engine, url):
+    async with engine:
+        return await engine.fetch(url)
+
+
+####################################################################
+# FetchEngine
+####################################################################
+
+def test_fetch_retries_errors_and_retry_statuses():
+    url = "http://host/page"
+    engine = StubEngine({url: [OSError("reset"), FetchResult(url, 503, ""), FetchResult(url, 200, "ok")]}, retries=2)
+    assert _run(_scan_fetch(engine, url)).text == "ok"
+    assert len(engine.requests) == 3
+
+    # Out of retries: the last retryable status is returned, the last error raised
+    engine = StubEngine({url: [OSError("reset"), FetchResult(url, 503, "")]}, retries=1)
+    assert _run(_scan_fetch(engine, url)).status == 503
+    engine = StubEngine({url: OSError("reset")}, retries=1)
+    with pytest.raises(OSError):
+        _run(_scan_fetch(engine, url))
+    assert len(engine.requests) == 2
+
+    # Other statuses are not retried
+    engine = StubEngine({url: FetchResult(url, 404, "")}, retries=3)
+    assert _run(_scan_fetch(engine, url)).status == 404 and len(engine.requests) == 1
+
+
+def test_min_interval_is_per_host():
+    async def fetch_all(engine, urls):
+        async with engine:
+            return await asyncio.gather(*(engine.fetch(u) for u in urls))
+
+    engine = StubEngine({}, min_interval=0.1)
+    start = time.perf_counter()
+    _run(fetch_all(engine, ["http://a/1", "http://a/2", "http://a/3"]))
+    one_host = time.perf_counter() - start
+
+    engine = StubEngine({}, min_interval=0.1)
+    start = time.perf_counter()
+    _run(fetch_all(engine, ["http://a/1", "http://b/1", "http://c/1"]))
+    three_hosts = time.perf_counter() - start
+
+    assert one_host >= 0.2
+    assert three_hosts < 0.1
+
+
+####################################################################
+# scan_source
+####################################################################
+
+def test_pagination_stops_at_empty_page():
+    register_source(_source("pg"))
+    pages = {
+        "http://pg/tablet?page=1": _page("http://pg/tablet?page=1", _items("pg", 0, 3)),
+        "http://pg/tablet?page=2": _page("http://pg/tablet?page=2", _items("pg", 3, 3)),
+        "http://pg/tablet?page=3": _page("http://pg/tablet?page=3", []),
+        **_detail_pages("pg", 6),
+    }
+    engine = StubEngine(pages)
+    records = _run(_scan(engine, ScanJob("pg", "tablet", limit=10)))
+    assert [r["title"] for r in records] == [f"pg-{i}" for i in range(6)]
+    assert [r["price"] for r in records] == [str(i) for i in range(6)]
+    requested = [url for url, _ in engine.requests]
+    assert "http://pg/tablet?page=3" in requested and "http://pg/tablet?page=4" not in requested
+
+
+def test_pagination_stops_at_limit_and_repeated_page():
+    register_source(_source("lim"))
+    first = _page("http://lim/tablet?page=1", _items("lim", 0, 3))
+    pages = {
+        "http://lim/tablet?page=1": first,
+        # Past the last page the site repeats the first one
+        "http://lim/tablet?page=2": first,
+        **_detail_pages("lim", 3),
+    }
+    engine = StubEngine(dict(pages))
+    records = _run(_scan(engine, ScanJob("lim", "tablet", limit=2)))
+    assert [r["title"] for r in records] == ["lim-0", "lim-1"]
+    assert [url for url, _ in engine.requests if "page=" in url] == ["http://lim/tablet?page=1"]
+
+    engine = StubEngine(dict(pages))
+    records = _run(_scan(engine, ScanJob("lim", "tablet", limit=10)))
+    assert len(records) == 3
+    assert [url for url, _ in engine.requests if "page=" in url] == [
+        "http://lim/tablet?page=1", "http://lim/tablet?page=2"
+    ]
+
+
+def test_failed_pages_and_details():
+    register_source(_source("err"))
+    pages = {
+        "http://err/tablet?page=1": _page("http://err/tablet?page=1", _items("err", 0, 2)),
+        "http://err/tablet?page=2": FetchResult("http://err/tablet?page=2", 403, ""),
+        "http://err/ad/0": _page("http://err/ad/0", {"price": "0"}),
+        "http://err/ad/1": FetchResult("http://err/ad/1", 404, ""),
+    }
+    records = _run(_scan(StubEngine(pages), ScanJob("err", "tablet", limit=10)))
+    # A bad detail page keeps the result-page fields, a bad result page ends the scan
+    assert records == [{"title": "err-0", "url": "http://err/ad/0", "price": "0"},
+                       {"title": "err-1", "url": "http://err/ad/1"}]
+
+
+####################################################################
+# scan_sources
+####################################################################
+
+def test_sources_run_concurrently():
+    # Two sources on separate hosts, each limited to one request per 50 ms
+    pages = {}
+    for name in ("slow-a", "slow-b"):
+        register_source(_source(name, min_interval=0.05))
+        pages[f"http://{name}/tablet?page=1"] = _page(f"http://{name}/tablet?page=1", _items(name, 0, 4))
+        pages.update(_detail_pages(name, 4))
+
+    async def timed(jobs):
+        engine = StubEngine(pages)
+        start = time.perf_counter()
+        async with engine:
+            results = await scan_sources(jobs, engine)
+        return time.perf_counter() - start, results
+
+    alone = [_run(timed([ScanJob(name, "tablet", limit=4)]))[0] for name in ("slow-a", "slow-b")]
+    together, results = _run(timed([ScanJob("slow-a", "tablet", limit=4), ScanJob("slow-b", "tablet", limit=4)]))
+    assert [len(r) for r in results] == [4, 4]
+    # About as long as the slowest source, well below running them one after another
+    assert together < 0.75 * sum(alone)
+    assert together < max(alone) * 1.5
+
+
+def test_scan_sources_errors():
+    register_source(_source("ok-src"))
+    pages = {"http://ok-src/tablet?page=1": _page("http://ok-src/tablet?page=1", _items("ok-src", 0, 1)),
+             **_detail_pages("ok-src", 1)}
+
+    async def run(jobs):
+        engine = StubEngine(pages)
+        async with engine:
+            return await scan_sources(jobs, engine)
+
+    # One failing source does not stop the others
+    results = _run(run([ScanJob("ok-src", "tablet"), ScanJob("no-such-source", "tablet")]))
+    assert [len(r) for r in results] == [1, 0]
+    # When every job fails the real error is raised
+    with pytest.raises(ValueError, match="Unknown source"):
+        _run(run([ScanJob("no-such-source", "tablet")]))
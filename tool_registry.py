@@ -0,0 +1,152 @@
+"""
+Lazily populated registry of LangChain tools.
+
+Tools are described by plain specs pointing at functions in core (or the
+parsing agents). LangChain, the target module and any pydantic args schema
+are only imported the first time an agent asks for a tool, and the built
+Tool is cached afterwards.
+
+Each function is exposed in two call styles:
+  - "kwargs": the function is passed to Tool as is,
+  - "json": the function takes a single JSON string/dict of its parameters
+    (see core.params.json_params_fn).
+"""
+import importlib
+
+from core.params import json_params_fn
+
+TOOL_SPECS = {
+    "json_writer": {
+        "name": "json_writer",
+        "func": "core.json_io:write_results_to_json",
+        "style": "kwargs",
+        "description": "Writes scraped data to a JSON file. Parameters: file_name (str), data (list of dicts).",
+    },
+    "json_writer_json": {
+        "name": "json_writer",
+        "func": "core.json_io:write_results_to_json",
+        "style": "json",
+        "description": "Writes scraped data to a JSON file. Accepts a JSON object with keys: 'file_name' (str), 'data' (list of dicts).",
+    },
+    "csv_writer": {
+        "name": "csv_writer",
+        "func": "core.csv_io:write_results_to_csv",
+        "style": "kwargs",
+        "description": "Writes scraped data to a CSV file. Parameters: file_name (str), data (list of dicts or list of lists).",
+    },
+    "json_to_csv": {
+        "name": "json_to_csv",
+        "func": "core.csv_io:json_to_csv",
+        "style": "kwargs",
+        "description": "Converts a JSON file to CSV format. Parameters: input_file (str), output_file (str), encoding (str). Returns the number of rows written.",
+    },
+    "json_to_csv_json": {
+        "name": "json_to_csv_tool",
+        "func": "core.csv_io:json_to_csv",
+        "style": "json",
+        "description": "Converts a JSON file to CSV format. Accepts a JSON object with keys: input_file (str), output_file (str), encoding (str, optional). Returns the number of rows written.",
+    },
+    "olx_scraper": {
+        "name": "scraper for olx.pl site",
+        "func": "core.olx_scraper:olx_scrape",
+        "style": "kwargs",
+        "args_schema": "tool_registry:_olx_scraper_args",
+        "description": "Scrapes OLX.pl for listings based on a search phrase. Saves results to a JSON file. Parameters: search_phrase (str, only the item like 'tablet' not all specifics of it), item_count (int), localisation (bool), maximize_window (bool), output_path (str), history_path (str, optional), use_browser (bool, optional), cache_dir (str, optional), offline (bool, optional). Returns a list of dictionaries with ad details.",
+    },
+    "olx_scraper_json": {
+        "name": "scraper for olx.pl site (json input)",
+        "func": "core.olx_scraper:olx_scrape",
+        "style": "json",
+        "description": "Scrapes OLX.pl for listings. Accepts a JSON object with parameters: search_phrase (str), item_count (int), localisation (bool), maximize_window (bool), output_path (str), history_path (str, optional), use_browser (bool, optional), cache_dir (str, optional), offline (bool, optional). Returns a list of dictionaries with ad details.",
+    },
+    "scan_sources_json": {
+        "name": "scan_sources_tool",
+        "func": "scraping_scripts.scan_sources:scan_sources",
+        "style": "json",
+        "description": "Scans several listing sites for the same query at once. Accepts a JSON object with keys: query (str), sources (str, comma separated, e.g. 'olx'), item_count (int, per source), output_path (str), cache_dir (str, optional), offline (bool, optional). Returns a list of dictionaries with a 'Source' key.",
+    },
+    "parse_json": {
+        "name": "parse_json_file_for_items",
+        "func": "parsing_agent:parse_json_file",
+        "style": "kwargs",
+        "description": "Parses a JSON file using a specified schema. Parameters: input_json_path (str), output_json_path (str), output_schema (dict), dynamic_instructions (str), queries_path (str, optional, saved alert queries), prompt_layout (str, optional: 'prefix' or 'input_first'). Returns parsed data as a list of dictionaries.",
+    },
+    "parse_json_json": {
+        "name": "parse_json_tool",
+        "func": "parsing_agent:parse_json_file",
+        "style": "json",
+        "description": "Parses a JSON file using a specified schema. Accepts a JSON object with keys: input_json_path (str), output_json_path (str), output_schema (dict or list), dynamic_instructions (str, optional), queries_path (str, optional, saved alert queries), prompt_layout (str, optional: 'prefix' or 'input_first'). Returns parsed data as a list of dictionaries.",
+    },
+}
+
+_tools = {}
+
+
+def _resolve(path):
+    module_name, attr = path.split(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _olx_scraper_args():
+    from typing import Optional
+
+    from pydantic import BaseModel, Field
+
+    class OLXScraperArgs(BaseModel):
+        search_phrase: str = Field(..., description="Phrase to search for (e.g. 'tablet')")
+        item_count: int = Field(10, description="Max number of items to scrape")
+        localisation: bool = Field(True, description="Use localisation (gdansk) or not")
+        maximize_window: bool = Field(True, description="Start browser maximized")
+        output_path: str = Field("olx_results.json", description="Output JSON file name")
+        history_path: str = Field("data/history", description="Price-history store directory ('' to skip)")
+        use_browser: bool = Field(False, description="Scrape through Chrome/Selenium instead of HTTP")
+        cache_dir: Optional[str] = Field(None, description="Keep fetched pages in this page cache directory")
+        offline: bool = Field(False, description="Replay from the page cache without network")
+
+    return OLXScraperArgs
+
+
+def get_tool(key):
+    """
+    Returns the LangChain Tool registered under key, building it on first use.
+    """
+    if key in _tools:
+        return _tools[key]
+    if key not in TOOL_SPECS:
+        raise ValueError(f"Unknown tool '{key}'. Available: {', '.join(sorted(TOOL_SPECS))}")
+
+    from langchain.tools import Tool
+
+    spec = TOOL_SPECS[key]
+    func = _resolve(spec["func"])
+    if spec["style"] == "json":
+        func = json_params_fn(func)
+
+    extra = {}
+    if "args_schema" in spec:
+        extra["args_schema"] = _resolve(spec["args_schema"])()
+
+    tool = Tool(name=spec["name"], func=func, description=spec["description"], **extra)
+    _tools[key] = tool
+    return tool
+
+
+def get_tools(*keys):
+    """
+    Returns a list of LangChain Tools for the given registry keys.
+    """
+    return [get_tool(key) for key in keys]
+
+
+def lazy_tool_attrs(module_name, names):
+    """
+    Builds a module-level __getattr__ (PEP 562) that resolves the given
+    attribute names to registry tools on first access, e.g.
+        __getattr__ = lazy_tool_attrs(__name__, {"json_writer": "json_writer"})
+    """
+    def __getattr__(name):
+        if name in names:
+            return get_tool(names[name])
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+    return __getattr__
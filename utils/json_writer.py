@@ -1,25 +1,9 @@
-import json
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-OUTPUT_PATH_BASE = ""
+from core.json_io import OUTPUT_PATH_BASE, write_results_to_json
+from tool_registry import lazy_tool_attrs
 
-def write_results_to_json(file_name, data):
-    """
-    Universal JSON writer.
-    Accepts a file name and a list of dicts (data).
-    Saves as UTF-8 encoded JSON file.
-    """
-    if not data:
-        raise ValueError("No data to write.")
-
-    full_file_path = OUTPUT_PATH_BASE + file_name
-
-    with open(full_file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-
-from langchain.tools import Tool
-json_writer = Tool(
-    name="json_writer",
-    func=write_results_to_json,
-    description="Writes scraped data to a JSON file. Parameters: file_name (str), data (list of dicts)."
-)
\ No newline at end of file
+# LangChain Tool is built on first access
+__getattr__ = lazy_tool_attrs(__name__, {"json_writer": "json_writer"})